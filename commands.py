@@ -5,19 +5,24 @@ Handles hard-coded universal commands and project-specific
 contextual commands loaded from commands/*.md files.
 """
 
+import functools
+import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Optional
-import logging
 
 from telegram import Bot, BotCommand, BotCommandScopeChat
 
 _log = logging.getLogger("tele-claude.commands")
 
 
-@dataclass
+@dataclass(frozen=True)
 class SlashCommand:
-    """Represents a slash command."""
+    """Represents a slash command.
+
+    Frozen (and therefore hashable) so command tuples can key the lookup
+    caches below; commands are never mutated after loading anyway.
+    """
 
     name: str  # Command name without slash (e.g., "plan")
     description: str  # Short description for Telegram autocompletion
@@ -147,6 +152,27 @@ async def register_commands_for_chat(
         _log.error(f"Failed to register commands for chat {chat_id}: {e}")
 
 
+# Hard-coded prompts indexed once: the common commands (/plan, /compact)
+# resolve with a single dict probe instead of a scan per message.
+_HARDCODED_PROMPTS: dict[str, str] = {cmd.name: cmd.prompt for cmd in HARDCODED_COMMANDS}
+
+
+@functools.lru_cache(maxsize=256)
+def _contextual_prompt(
+    command_name: str, contextual_commands: tuple[SlashCommand, ...]
+) -> Optional[str]:
+    """Memoized scan of a session's contextual commands.
+
+    Keyed on the command tuple itself, so a project with edited command
+    files gets a fresh entry while repeat lookups within a session are
+    dict hits.
+    """
+    for cmd in contextual_commands:
+        if cmd.name == command_name:
+            return cmd.prompt
+    return None
+
+
 def get_command_prompt(
     command_name: str, contextual_commands: list[SlashCommand]
 ) -> Optional[str]:
@@ -160,27 +186,16 @@ def get_command_prompt(
         Prompt string if found, None if unknown command
     """
     # Check hard-coded first (they take precedence)
-    for cmd in HARDCODED_COMMANDS:
-        if cmd.name == command_name:
-            return cmd.prompt
+    prompt = _HARDCODED_PROMPTS.get(command_name)
+    if prompt is not None:
+        return prompt
+    if not contextual_commands:
+        return None
+    return _contextual_prompt(command_name, tuple(contextual_commands))
 
-    # Check contextual
-    for cmd in contextual_commands:
-        if cmd.name == command_name:
-            return cmd.prompt
-
-    return None
 
-
-def get_help_message(contextual_commands: list[SlashCommand]) -> str:
-    """Generate help message listing all available commands.
-
-    Args:
-        contextual_commands: Project-specific commands for current session
-
-    Returns:
-        Formatted help message string (HTML)
-    """
+@functools.lru_cache(maxsize=64)
+def _help_message(contextual_commands: tuple[SlashCommand, ...]) -> str:
     lines = ["<b>Available Commands</b>\n"]
 
     # Global commands section
@@ -195,3 +210,18 @@ def get_help_message(contextual_commands: list[SlashCommand]) -> str:
             lines.append(f"  /{cmd.name} - {cmd.description}")
 
     return "\n".join(lines)
+
+
+def get_help_message(contextual_commands: list[SlashCommand]) -> str:
+    """Generate help message listing all available commands.
+
+    The assembled text is memoized per distinct command set; repeat
+    /help calls in a session cost one tuple() and a cache hit.
+
+    Args:
+        contextual_commands: Project-specific commands for current session
+
+    Returns:
+        Formatted help message string (HTML)
+    """
+    return _help_message(tuple(contextual_commands))
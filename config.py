@@ -1,49 +1,159 @@
+import functools
+import json
+import logging
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
-load_dotenv()
 
-# --- Dispatcher Config (shared across transports) ---
+@functools.lru_cache(maxsize=1)
+def _ensure_env() -> None:
+    """Read .env exactly once per process, even across module reloads."""
+    load_dotenv()
+
+
+_ensure_env()
+
+# Snapshot of the process environment taken once at import. All config
+# reads below hit this plain dict instead of probing os.environ repeatedly.
+_env: dict[str, str] = dict(os.environ)
+
+
 def _env_int(key: str, default: int) -> int:
     try:
-        return int(os.getenv(key, str(default)))
+        return int(_env.get(key, default))
     except (TypeError, ValueError):
         return default
 
-DISPATCHER_WORKERS = _env_int("DISPATCHER_WORKERS", 4)
-DISPATCHER_MAX_QUEUE = _env_int("DISPATCHER_MAX_QUEUE", 1000)
-DISPATCHER_QUEUE_WARN = _env_int("DISPATCHER_QUEUE_WARN", 200)
+
+def _env_float(key: str, default: float) -> float:
+    try:
+        return float(_env.get(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_bool(key: str, default: bool) -> bool:
+    value = _env.get(key)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off")
+
+
+# --- Dispatcher Config (shared across transports) ---
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Immutable snapshot of tunable settings, parsed once at import."""
+
+    dispatcher_workers: int
+    dispatcher_max_queue: int
+    dispatcher_queue_warn: int
+    task_api_host: str
+    task_api_port: int
+
+
+CONFIG = Config(
+    dispatcher_workers=_env_int("DISPATCHER_WORKERS", 4),
+    dispatcher_max_queue=_env_int("DISPATCHER_MAX_QUEUE", 1000),
+    dispatcher_queue_warn=_env_int("DISPATCHER_QUEUE_WARN", 200),
+    task_api_host=_env.get("TASK_API_HOST", "127.0.0.1"),
+    task_api_port=_env_int("TASK_API_PORT", 9111),
+)
+
+DISPATCHER_WORKERS = CONFIG.dispatcher_workers
+DISPATCHER_MAX_QUEUE = CONFIG.dispatcher_max_queue
+DISPATCHER_QUEUE_WARN = CONFIG.dispatcher_queue_warn
+
+# Coalesce bursts of queued triggers into one Claude turn (see SessionActor).
+# Set DISPATCHER_MAILBOX_COALESCE=0 to process each message individually.
+DISPATCHER_MAILBOX_COALESCE = _env_bool("DISPATCHER_MAILBOX_COALESCE", True)
+
+# Evict in-memory session actors idle longer than this (seconds). Persisted
+# Claude session ids survive eviction, so a later message transparently
+# recreates the actor. Set to 0 to disable eviction.
+SESSION_IDLE_TIMEOUT = _env_float("SESSION_IDLE_TIMEOUT", 24 * 60 * 60)
+
+# How often the dispatcher sweeps for idle actors (seconds).
+SESSION_CLEANUP_INTERVAL = _env_float("SESSION_CLEANUP_INTERVAL", 15 * 60)
+
+# How long to wait for the rest of a message burst before interrupting an
+# active query (seconds). Paid only when an interrupt is already due, so a
+# two-message burst costs one interrupt + one Claude turn instead of two.
+# Set to 0 to interrupt immediately.
+DISPATCHER_DEBOUNCE_WINDOW = _env_float("DISPATCHER_DEBOUNCE_WINDOW", 0.25)
 
 # --- Telegram Config ---
-BOT_TOKEN = os.getenv("BOT_TOKEN")
-PROJECTS_DIR = Path(os.getenv("PROJECTS_DIR", Path.home() / "Projects"))
+BOT_TOKEN = _env.get("BOT_TOKEN")
+PROJECTS_DIR = Path(_env.get("PROJECTS_DIR", Path.home() / "Projects"))
 GENERAL_TOPIC_ID = 0
 
 # Authorized chat IDs - only these group chats can use the bot
 # Set via ALLOWED_CHATS env var as comma-separated Telegram chat IDs
 # Example: ALLOWED_CHATS=-1001234567890,-1009876543210
-_allowed_chats_str = os.getenv("ALLOWED_CHATS", "")
-ALLOWED_CHATS: set[int] = {
-    int(cid.strip()) for cid in _allowed_chats_str.split(",") if cid.strip()
-}
+_allowed_chats_str = _env.get("ALLOWED_CHATS", "")
+ALLOWED_CHATS: frozenset[int] = frozenset(
+    map(int, (part for part in map(str.strip, _allowed_chats_str.split(",")) if part))
+)
+
+# 64-bit Bloom prefilter over an id allow-list. Two bit lanes per id (low
+# bits and a Fibonacci-hash lane) let the hot path reject unknown ids with
+# two shifts and an AND before falling back to the set lookup.
+_BLOOM_MULT = 0x9E3779B97F4A7C15
+_U64 = (1 << 64) - 1
+
+
+def bloom_mask(ids: frozenset[int]) -> int:
+    """Build a 64-bit Bloom bitmap for an allow-list of integer ids."""
+    mask = 0
+    for i in ids:
+        mask |= 1 << (i & 63)
+        mask |= 1 << ((i * _BLOOM_MULT & _U64) >> 58)
+    return mask
+
+
+def bloom_contains(mask: int, i: int) -> bool:
+    """Check whether an id may be present in a Bloom bitmap (no false negatives)."""
+    return bool(
+        mask >> (i & 63) & 1 and mask >> ((i * _BLOOM_MULT & _U64) >> 58) & 1
+    )
+
 
 # --- Discord Config ---
-DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
+DISCORD_BOT_TOKEN = _env.get("DISCORD_BOT_TOKEN")
 
 # Authorized Discord guild (server) IDs
 # Set via DISCORD_ALLOWED_GUILDS env var as comma-separated IDs
-_discord_guilds_str = os.getenv("DISCORD_ALLOWED_GUILDS", "")
-DISCORD_ALLOWED_GUILDS: set[int] = {
-    int(gid.strip()) for gid in _discord_guilds_str.split(",") if gid.strip()
-}
+_discord_guilds_str = _env.get("DISCORD_ALLOWED_GUILDS", "")
+DISCORD_ALLOWED_GUILDS: frozenset[int] = frozenset(
+    map(int, (part for part in map(str.strip, _discord_guilds_str.split(",")) if part))
+)
+
+# Optional explicit channel → project mapping, set via DISCORD_CHANNEL_PROJECTS
+# as a JSON object: {"<channel_id>": "/path/to/project"}. Parsed once at
+# import with values pre-resolved to Paths so per-message lookups are a
+# plain dict probe.
+def _parse_channel_projects(raw: str) -> dict[int, Path]:
+    if not raw:
+        return {}
+    try:
+        return {int(cid): Path(path).resolve() for cid, path in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError) as exc:
+        logging.getLogger("tele-claude.config").warning(
+            "Ignoring malformed DISCORD_CHANNEL_PROJECTS: %s", exc
+        )
+        return {}
+
 
+DISCORD_CHANNEL_PROJECTS: dict[int, Path] = _parse_channel_projects(
+    _env.get("DISCORD_CHANNEL_PROJECTS", "")
+)
 
 # --- Claude Model ---
 # Set via CLAUDE_MODEL env var (e.g., claude-opus-4-6-20260205)
 # Defaults to None which lets the SDK pick the default model
-CLAUDE_MODEL = os.getenv("CLAUDE_MODEL")
+CLAUDE_MODEL = _env.get("CLAUDE_MODEL")
 
 # --- Task Injection API ---
-TASK_API_HOST = os.getenv("TASK_API_HOST", "127.0.0.1")
-TASK_API_PORT = _env_int("TASK_API_PORT", 9111)
+TASK_API_HOST = CONFIG.task_api_host
+TASK_API_PORT = CONFIG.task_api_port
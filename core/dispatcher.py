@@ -2,15 +2,19 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from pathlib import Path
 from typing import Awaitable, Callable, Optional, Protocol, runtime_checkable, Any
 
+from config import SESSION_CLEANUP_INTERVAL, SESSION_IDLE_TIMEOUT
 from core.session_actor import SessionActor
 from core.session_store import session_store
 from core.types import ReplyTarget, Trigger
 
 _log = logging.getLogger("tele-claude.dispatcher.v2")
 
+_LOCK_STRIPES = 32
+
 
 @runtime_checkable
 class TransportListener(Protocol):
@@ -40,12 +44,22 @@ class TransportListener(Protocol):
 
 
 class Dispatcher:
-    """Central coordinator for all transports and sessions."""
+    """Central coordinator for all transports and sessions.
+
+    Work is sharded by session: each SessionActor owns a private mailbox
+    and run loop, so one busy conversation never blocks another and no
+    global work queue or per-session lock is needed after admission.
+    """
 
     def __init__(self) -> None:
         self._sessions: dict[str, SessionActor] = {}
         self._listeners: dict[str, TransportListener] = {}
-        self._session_lock = asyncio.Lock()
+        self._platform_ids: dict[str, int] = {}
+        self._listener_by_id: list[TransportListener] = []
+        # Striped locks: admission for unrelated sessions proceeds in
+        # parallel; only creations hashing to the same stripe serialize.
+        self._session_locks = tuple(asyncio.Lock() for _ in range(_LOCK_STRIPES))
+        self._cleanup_task: Optional[asyncio.Task] = None
         session_store.load()
         session_store.cleanup_expired()
 
@@ -57,23 +71,100 @@ class Dispatcher:
         if listener.platform in self._listeners:
             raise ValueError(f"Listener already registered: {listener.platform}")
         self._listeners[listener.platform] = listener
+        self._platform_ids[listener.platform] = len(self._listener_by_id)
+        self._listener_by_id.append(listener)
 
     def get_listener(self, platform: str) -> Optional[TransportListener]:
         return self._listeners.get(platform)
 
+    @property
+    def has_listeners(self) -> bool:
+        """True if any transport listener is registered."""
+        return bool(self._listeners)
+
     async def start(self) -> None:
         for listener in self._listeners.values():
             await listener.start(self.route_trigger)
+        if SESSION_IDLE_TIMEOUT > 0:
+            self._cleanup_task = asyncio.create_task(self._cleanup_loop())
+
+    async def _cleanup_loop(self) -> None:
+        """Periodically evict idle actors so long-running memory stays bounded."""
+        while True:
+            await asyncio.sleep(SESSION_CLEANUP_INTERVAL)
+            try:
+                await self.cleanup_idle_sessions(SESSION_IDLE_TIMEOUT)
+            except Exception:
+                _log.exception("Idle session cleanup failed")
 
     async def stop(self) -> None:
+        if self._cleanup_task is not None:
+            self._cleanup_task.cancel()
+            try:
+                await self._cleanup_task
+            except asyncio.CancelledError:
+                pass
+            self._cleanup_task = None
         for session in list(self._sessions.values()):
             await session.close()
         for listener in self._listeners.values():
             await listener.stop()
 
+    async def remove_session(self, session_key: str) -> None:
+        """Close and drop one session actor."""
+        session = self._sessions.pop(session_key, None)
+        if session is not None:
+            await session.close()
+
+    async def cleanup_idle_sessions(self, max_idle_seconds: float) -> int:
+        """Evict actors idle beyond the threshold so memory stays bounded.
+
+        Safe because route_trigger recreates actors on demand and the
+        session store preserves their Claude session ids.
+        """
+        cutoff = time.time() - max_idle_seconds
+        idle = [
+            key
+            for key, session in self._sessions.items()
+            if session.stats.last_activity < cutoff
+            and not (session.current_task and not session.current_task.done())
+        ]
+        removed = 0
+        for key in idle:
+            session = self._sessions.get(key)
+            if session is None:
+                continue
+            # Re-check right before the pop: while an earlier close() in
+            # this sweep was awaited, route_trigger's lock-free fast path
+            # may have enqueued into (or reactivated) this actor, and
+            # closing it then would drop the queued trigger with the run
+            # loop. No await separates these checks from remove_session's
+            # pop, so the verdict cannot go stale.
+            if (
+                session.mailbox_size
+                or session.stats.last_activity >= cutoff
+                or (session.current_task and not session.current_task.done())
+            ):
+                continue
+            await self.remove_session(key)
+            removed += 1
+        if removed:
+            _log.info("Evicted %d idle session actors", removed)
+        return removed
+
     async def route_trigger(self, trigger: Trigger) -> None:
         """Route trigger to session. Enqueues and returns immediately."""
-        async with self._session_lock:
+        # Fast path: existing session needs no lock (no await between the
+        # dict read and enqueue, so the actor cannot disappear under us).
+        session = self._sessions.get(trigger.session_key)
+        if session is not None:
+            await session.enqueue(trigger)
+            return
+
+        trigger.platform_id = self._platform_ids.get(trigger.platform, -1)
+        lock = self._session_locks[hash(trigger.session_key) & (_LOCK_STRIPES - 1)]
+        async with lock:
+            # Re-check: another trigger may have created it while we waited.
             if trigger.session_key not in self._sessions:
                 try:
                     session = await self._create_session(trigger)
@@ -91,7 +182,11 @@ class Dispatcher:
         await session.enqueue(trigger)
 
     async def _create_session(self, trigger: Trigger) -> Optional[SessionActor]:
-        listener = self._listeners.get(trigger.platform)
+        listener = (
+            self._listener_by_id[trigger.platform_id]
+            if 0 <= trigger.platform_id < len(self._listener_by_id)
+            else self._listeners.get(trigger.platform)
+        )
         if not listener:
             raise ValueError(f"No listener for platform: {trigger.platform}")
 
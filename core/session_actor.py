@@ -2,16 +2,51 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import time
+import re
+from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional, Any
+from typing import Awaitable, Callable, Optional, Any
 
+from config import (
+    DISPATCHER_DEBOUNCE_WINDOW,
+    DISPATCHER_MAILBOX_COALESCE,
+    DISPATCHER_MAX_QUEUE,
+    DISPATCHER_QUEUE_WARN,
+)
 from core.types import ReplyTarget, SessionStats, Trigger
 
 _log = logging.getLogger("tele-claude.session_actor")
 
+# Matches the command token of "/cmd args" without tokenizing the whole
+# prompt; an optional @botname mention is consumed but kept out of the
+# captured name, so no per-command partition pass is needed.
+_COMMAND_RE = re.compile(r"^/([^@\s]+)(?:@\S+)?")
 
-@dataclass
+# Lazily bound on first use: importing session/commands at module level would
+# be circular, but re-running the import statement per message is wasted work.
+_session_module: Any = None
+_get_command_prompt: Any = None
+
+
+def _session() -> Any:
+    global _session_module
+    if _session_module is None:
+        import session
+
+        _session_module = session
+    return _session_module
+
+
+def _command_prompt_lookup() -> Any:
+    global _get_command_prompt
+    if _get_command_prompt is None:
+        from commands import get_command_prompt
+
+        _get_command_prompt = get_command_prompt
+    return _get_command_prompt
+
+
+@dataclass(slots=True)
 class SessionActor:
     """Isolated session handling one conversation."""
 
@@ -21,15 +56,45 @@ class SessionActor:
     reply_target: ReplyTarget
     claude_session: Any
 
-    _mailbox: asyncio.Queue[Trigger] = field(default_factory=asyncio.Queue)
+    # Optional hook for platform-specific slash commands. Called with
+    # (command_name, args); returning True consumes the command. Keeps a
+    # single canonical actor class instead of per-platform subclasses.
+    platform_command: Optional[Callable[[str, str], Awaitable[bool]]] = None
+
+    # Single-consumer mailbox: a plain deque plus a wakeup event is cheaper
+    # than asyncio.Queue (no internal lock, no task_done bookkeeping).
+    _mailbox: deque[Trigger] = field(default_factory=deque)
+    _wake: asyncio.Event = field(default_factory=asyncio.Event)
+    _next_warn_at: int = DISPATCHER_QUEUE_WARN
     _run_loop_task: Optional[asyncio.Task] = None
     _generation_id: int = 0
 
     active: bool = True
     current_task: Optional[asyncio.Task] = None
-    pending_permission: Optional[asyncio.Future] = None
+    # Permission requests use an Event plus result slot rather than a
+    # Future: no callback list to allocate and no cancellation dance.
+    pending_permission: Optional[asyncio.Event] = None
+    pending_permission_result: Optional[bool] = None
     stats: SessionStats = field(default_factory=SessionStats)
 
+    # Attribute probes of claude_session resolved once at construction so the
+    # per-message path avoids repeated hasattr/getattr.
+    _supports_pending_image: bool = field(init=False, default=False)
+    _thread_id: Optional[int] = field(init=False, default=None)
+    _bot: Any = field(init=False, default=None)
+    _contextual_commands: list = field(init=False, default_factory=list)
+
+    def __post_init__(self) -> None:
+        self._supports_pending_image = hasattr(self.claude_session, "pending_image_path")
+        self._thread_id = getattr(self.claude_session, "thread_id", None)
+        self._bot = getattr(self.claude_session, "bot", None)
+        self._contextual_commands = getattr(self.claude_session, "contextual_commands", [])
+
+    @property
+    def mailbox_size(self) -> int:
+        """Number of triggers queued and not yet processed."""
+        return len(self._mailbox)
+
     async def start(self) -> None:
         """Start the actor's run loop."""
         if self._run_loop_task is None or self._run_loop_task.done():
@@ -37,18 +102,62 @@ class SessionActor:
 
     async def enqueue(self, trigger: Trigger) -> None:
         """Add trigger to mailbox."""
-        await self._mailbox.put(trigger)
+        # Bound the mailbox per session: when full, the *oldest* queued item
+        # for this session is dropped rather than the new one, and only this
+        # session pays — other sessions have their own mailboxes, so a chatty
+        # chat can never starve a quiet one.
+        if len(self._mailbox) >= DISPATCHER_MAX_QUEUE:
+            dropped = self._mailbox.popleft()
+            self.stats.error_count += 1
+            _log.warning(
+                "Mailbox full for session_key=%s; dropped oldest queued trigger (source=%s)",
+                self.session_key,
+                dropped.source,
+            )
+        self._mailbox.append(trigger)
+        # One comparison on the common path; warn at most once per 128
+        # items past the threshold instead of a modulo every enqueue.
+        depth = len(self._mailbox)
+        if depth >= self._next_warn_at:
+            _log.warning("Mailbox depth %d for session_key=%s", depth, self.session_key)
+            self._next_warn_at = depth + 128
+        self._wake.set()
 
     async def _run_loop(self) -> None:
         """Main actor loop - processes mailbox sequentially."""
         while self.active:
             try:
-                trigger = await self._mailbox.get()
+                await self._wake.wait()
             except asyncio.CancelledError:
                 break
 
+            if not self._mailbox:
+                self._wake.clear()
+                self._next_warn_at = DISPATCHER_QUEUE_WARN
+                continue
+            trigger = self._mailbox.popleft()
+
+            if DISPATCHER_MAILBOX_COALESCE:
+                trigger = self._drain_mailbox(trigger)
+            if not self._mailbox:
+                self._wake.clear()
+                # Backlog cleared: re-arm the depth warning at the base
+                # threshold so the next backlog warns too, instead of
+                # staying ratcheted at the all-time high.
+                self._next_warn_at = DISPATCHER_QUEUE_WARN
+
             try:
                 if self.current_task and not self.current_task.done():
+                    # An interrupt is about to be paid. Chat-style bursts
+                    # usually arrive within a fraction of a second, so wait
+                    # briefly and fold any stragglers into this turn: N quick
+                    # messages then cost one interrupt and one Claude start
+                    # instead of N. Slash commands skip the wait — they are
+                    # deliberate single actions, not burst fragments.
+                    if DISPATCHER_DEBOUNCE_WINDOW > 0 and not trigger.prompt.startswith("/"):
+                        await asyncio.sleep(DISPATCHER_DEBOUNCE_WINDOW)
+                        if self._mailbox:
+                            trigger = self._drain_mailbox(trigger)
                     self._generation_id += 1
                     self.stats.interrupt_count += 1
                     await self._cancel_current_task()
@@ -58,62 +167,84 @@ class SessionActor:
             except Exception:
                 self.stats.error_count += 1
                 _log.exception("SessionActor run loop failed session_key=%s", self.session_key)
-            finally:
-                self._mailbox.task_done()
+
+    def _drain_mailbox(self, trigger: Trigger) -> Trigger:
+        """Merge any queued triggers into one, so a burst costs a single
+        cancel+start cycle instead of one per message."""
+        prompts = [trigger.prompt] if trigger.prompt else []
+        images = list(trigger.images)
+        newest = trigger
+        while self._mailbox:
+            extra = self._mailbox.popleft()
+            if extra.prompt:
+                prompts.append(extra.prompt)
+            images.extend(extra.images)
+            newest = extra
+        if newest is trigger:
+            return trigger
+        return Trigger(
+            platform=newest.platform,
+            session_key=newest.session_key,
+            prompt="\n\n".join(prompts),
+            images=images,
+            reply_context=newest.reply_context,
+            source=newest.source,
+        )
 
     async def _handle_prompt(self, prompt: str, images: list[str], gen_id: int) -> None:
         """Process a user prompt. gen_id guards stale operations."""
-        if not prompt.strip() and not images:
+        has_text = bool(prompt.strip())
+        if not has_text and not images:
             return
 
         # Handle image-only messages by buffering until a prompt arrives.
-        if images and not prompt.strip():
-            if hasattr(self.claude_session, "pending_image_path"):
+        if images and not has_text:
+            if self._supports_pending_image:
                 self.claude_session.pending_image_path = images[0]
             return
 
-        if hasattr(self.claude_session, "pending_image_path"):
+        # Assemble pending image, attached images, and text in one join
+        # instead of repeated string concatenation.
+        parts: list[str] = []
+        if self._supports_pending_image:
             pending_image = self.claude_session.pending_image_path
             if pending_image:
                 self.claude_session.pending_image_path = None
-                prompt = f"{pending_image}\n\n{prompt}" if prompt.strip() else pending_image
+                parts.append(pending_image)
+        parts.extend(images)
+        parts.append(prompt)
+        if len(parts) > 1:
+            prompt = "\n\n".join(parts)
 
-        if images:
-            image_block = "\n".join(images)
-            prompt = f"{image_block}\n\n{prompt}" if prompt.strip() else image_block
+        command_match = _COMMAND_RE.match(prompt)
+        if command_match:
+            command_name = command_match.group(1)
 
-        if prompt.startswith("/"):
-            command_name = prompt.split()[0].lstrip("/").split("@")[0]
+            if self.platform_command is not None:
+                args = prompt[command_match.end():].strip()
+                if await self.platform_command(command_name, args):
+                    return
 
             # /model is handled directly — not sent to Claude
             if command_name == "model":
-                import session as session_module
-
-                thread_id = getattr(self.claude_session, "thread_id", None)
-                if thread_id is not None:
-                    args = prompt[len(prompt.split()[0]):].strip()
-                    await session_module.handle_model_command(thread_id, args)
+                if self._thread_id is not None:
+                    args = prompt[command_match.end():].strip()
+                    await _session().handle_model_command(self._thread_id, args)
                 return
 
-            from commands import get_command_prompt
-
-            contextual = getattr(self.claude_session, "contextual_commands", [])
-            command_prompt = get_command_prompt(command_name, contextual)
+            command_prompt = _command_prompt_lookup()(command_name, self._contextual_commands)
             if command_prompt is not None:
                 prompt = command_prompt
 
-        self.stats.message_count += 1
-        self.stats.last_activity = time.time()
-
         try:
-            import session as session_module
-
-            thread_id = getattr(self.claude_session, "thread_id", None)
-            bot = getattr(self.claude_session, "bot", None)
-            if thread_id is None:
+            if self._thread_id is None:
                 _log.warning("Missing thread_id for session_key=%s", self.session_key)
                 return
-            task = session_module.start_claude_task(thread_id, prompt, bot)
+            # Only count messages we actually hand to Claude; command-only
+            # paths above never reach here.
+            self.stats.message_count += 1
+            self.stats.touch()
+            task = _session().start_claude_task(self._thread_id, prompt, self._bot)
             if task is None:
                 self.stats.error_count += 1
                 _log.warning("Failed to start Claude task session_key=%s", self.session_key)
@@ -128,11 +259,8 @@ class SessionActor:
         if self.current_task:
             interrupted = False
             try:
-                import session as session_module
-
-                thread_id = getattr(self.claude_session, "thread_id", None)
-                if thread_id is not None:
-                    interrupted = await session_module.interrupt_session(thread_id)
+                if self._thread_id is not None:
+                    interrupted = await _session().interrupt_session(self._thread_id)
             except Exception:
                 _log.exception("interrupt_session failed session_key=%s", self.session_key)
 
@@ -144,14 +272,16 @@ class SessionActor:
                     pass
             self.current_task = None
 
-        if self.pending_permission and not self.pending_permission.done():
-            self.pending_permission.cancel()
+        if self.pending_permission and not self.pending_permission.is_set():
+            self.pending_permission_result = False
+            self.pending_permission.set()
         self.pending_permission = None
 
     async def resolve_permission(self, allowed: bool, always: bool) -> None:
         """Resolve a pending permission request."""
-        if self.pending_permission and not self.pending_permission.done():
-            self.pending_permission.set_result(allowed)
+        if self.pending_permission and not self.pending_permission.is_set():
+            self.pending_permission_result = allowed
+            self.pending_permission.set()
         self.pending_permission = None
 
     async def close(self) -> None:
@@ -5,95 +5,272 @@ import logging
 import os
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from threading import Lock
 from typing import Optional
 
 from core.types import PersistedSession
 
+try:
+    # Optional SIMD-accelerated JSON; stdlib json is the fallback.
+    import orjson
+except ImportError:
+    orjson = None
+
 _log = logging.getLogger("tele-claude.session_store")
 
+
+def _json_dumps(data: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(raw: bytes | str) -> object:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 _STORE_VERSION = 1
 _DEFAULT_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
 _DEFAULT_STORE_PATH = Path(__file__).resolve().parents[1] / ".bot-sessions.json"
 
+# Compact the append-only log into a fresh snapshot once it grows past this.
+_LOG_COMPACT_LINES = 1000
+
+# Coalesce log fsyncs: at most one durable flush per window, so a busy chat
+# does not serialize every message behind disk latency.
+_LOG_FSYNC_INTERVAL = 0.5
+
 
 class SessionStore:
-    """Persistent session metadata store."""
+    """Persistent session metadata store.
+
+    Mutations append single-row deltas to a JSONL log next to the snapshot
+    file, so per-update disk cost is O(entry) instead of re-serializing the
+    whole store. The log is replayed on load and compacted into the snapshot
+    periodically.
+    """
 
     def __init__(self, path: Optional[Path] = None, max_age_seconds: int = _DEFAULT_MAX_AGE_SECONDS) -> None:
         self._path = path or _DEFAULT_STORE_PATH
+        self._log_path = self._path.with_suffix(".log")
+        self._log_fd: Optional[int] = None
+        self._log_lines = 0
+        self._log_dirty = False
+        self._last_fsync = 0.0
         self._max_age_seconds = max_age_seconds
+        # Treated as immutable by readers: writers copy, mutate, and swap the
+        # reference under the lock, so get() never needs to take it.
         self._sessions: dict[str, PersistedSession] = {}
+        # JSON-ready mirror of _sessions, mutated in lockstep so saving
+        # never has to rebuild the full nested dict.
+        self._serialized: dict[str, dict] = {}
         self._lock = Lock()
+        # Single worker for durable-write work (log fsync, compaction), so
+        # the event-loop thread never waits on disk for routine updates.
+        # One worker also serializes those jobs against each other.
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="session-store"
+        )
+        self._flush_pending = False
 
     def load(self) -> None:
-        """Load session data from disk."""
+        """Load session data from disk (snapshot plus delta log replay)."""
         with self._lock:
             self._sessions = {}
-            if not self._path.exists():
-                _log.info("Session store file not found at %s", self._path)
+            self._load_snapshot_unlocked()
+            self._log_lines = self._replay_log_unlocked()
+            if self._log_lines:
+                _log.info("Replayed %d session store log entries", self._log_lines)
+            self._serialized = {
+                key: self._entry_dict(session) for key, session in self._sessions.items()
+            }
+
+    def _load_snapshot_unlocked(self) -> None:
+        if not self._path.exists():
+            _log.info("Session store file not found at %s", self._path)
+            return
+
+        try:
+            raw = self._path.read_bytes()
+            if not raw.strip():
                 return
+            data = _json_loads(raw)
+        except Exception as exc:
+            _log.warning("Failed to load session store: %s", exc)
+            return
+
+        if not isinstance(data, dict):
+            _log.warning("Session store has invalid format")
+            return
+        if data.get("version") != _STORE_VERSION:
+            _log.warning("Session store version mismatch: %s", data.get("version"))
+            return
+
+        sessions = data.get("sessions", {})
+        if not isinstance(sessions, dict):
+            _log.warning("Session store sessions invalid format")
+            return
+
+        for session_key, payload in sessions.items():
+            if not isinstance(payload, dict):
+                _log.warning("Skipping invalid session entry for %s", session_key)
+                continue
+            session = self._parse_entry(payload)
+            if session is None:
+                _log.warning("Skipping invalid session entry for %s", session_key)
+                continue
+            self._sessions[session_key] = session
+        _log.info("Loaded %d persisted sessions from %s", len(self._sessions), self._path)
+
+    @staticmethod
+    def _entry_dict(session: PersistedSession) -> dict:
+        return {
+            "claude_session_id": session.claude_session_id,
+            "cwd": session.cwd,
+            "platform": session.platform,
+            "created_at": session.created_at,
+            "last_activity": session.last_activity,
+            "message_count": session.message_count,
+        }
 
+    @staticmethod
+    def _parse_entry(payload: dict) -> Optional[PersistedSession]:
+        # JSON already yields str/float for these fields; re-coercing every
+        # value just burns time in the load loop for large stores.
+        try:
+            return PersistedSession(
+                claude_session_id=payload["claude_session_id"],
+                cwd=payload["cwd"],
+                platform=payload["platform"],
+                created_at=payload["created_at"],
+                last_activity=payload["last_activity"],
+                message_count=payload.get("message_count", 0),
+            )
+        except Exception:
+            return None
+
+    def _replay_log_unlocked(self) -> int:
+        if not self._log_path.exists():
+            return 0
+        try:
+            raw = self._log_path.read_text(encoding="utf-8")
+        except Exception as exc:
+            _log.warning("Failed to read session store log: %s", exc)
+            return 0
+
+        count = 0
+        for line in raw.splitlines():
+            line = line.strip()
+            if not line:
+                continue
             try:
-                raw = self._path.read_text(encoding="utf-8")
-                if not raw.strip():
-                    return
-                data = json.loads(raw)
-            except Exception as exc:
-                _log.warning("Failed to load session store: %s", exc)
-                return
+                row = _json_loads(line)
+            except Exception:
+                _log.warning("Skipping corrupt session store log line")
+                continue
+            if not isinstance(row, dict):
+                continue
+            key = row.get("key")
+            if not key:
+                continue
+            op = row.get("op")
+            if op == "remove":
+                self._sessions.pop(key, None)
+                count += 1
+            elif op == "upsert":
+                session = self._parse_entry(row)
+                if session is not None:
+                    self._sessions[key] = session
+                    count += 1
+        return count
+
+    def _append_log_unlocked(self, row: dict) -> None:
+        try:
+            if self._log_fd is None:
+                self._path.parent.mkdir(parents=True, exist_ok=True)
+                self._log_fd = os.open(
+                    self._log_path,
+                    os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                    0o644,
+                )
+            os.write(self._log_fd, _json_dumps(row) + b"\n")
+            self._log_dirty = True
+            self._log_lines += 1
+            self._schedule_flush_unlocked()
+        except Exception as exc:
+            _log.error("Failed to append session store log: %s", exc)
+            return
+        if self._log_lines >= _LOG_COMPACT_LINES:
+            # Compaction does a full snapshot write+fsync+rename; run it on
+            # the I/O worker so the caller (usually the event-loop thread)
+            # is not stalled behind it. The worker re-checks the threshold
+            # under the lock, so a burst of appends schedules it only once.
+            self._io_executor.submit(self._compact_if_needed)
 
-            if not isinstance(data, dict):
-                _log.warning("Session store has invalid format")
+    def _schedule_flush_unlocked(self) -> None:
+        if self._flush_pending:
+            return
+        self._flush_pending = True
+        self._io_executor.submit(self._flush_log)
+
+    def _flush_log(self) -> None:
+        """Coalesced durable flush, run on the I/O worker.
+
+        Sleeps out the remainder of the fsync window so a burst of appends
+        pays one fsync, then flushes whatever is still dirty — including
+        the trailing append of the burst, which the old inline scheme left
+        unsynced until the next write happened to arrive.
+        """
+        delay = self._last_fsync + _LOG_FSYNC_INTERVAL - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self._flush_pending = False
+            if self._log_fd is None or not self._log_dirty:
                 return
-            if data.get("version") != _STORE_VERSION:
-                _log.warning("Session store version mismatch: %s", data.get("version"))
+            try:
+                os.fsync(self._log_fd)
+            except Exception as exc:
+                _log.error("Failed to fsync session store log: %s", exc)
                 return
+            self._log_dirty = False
+            self._last_fsync = time.monotonic()
 
-            sessions = data.get("sessions", {})
-            if not isinstance(sessions, dict):
-                _log.warning("Session store sessions invalid format")
-                return
+    def _compact_if_needed(self) -> None:
+        with self._lock:
+            if self._log_lines >= _LOG_COMPACT_LINES:
+                self._compact_unlocked()
 
-            for session_key, payload in sessions.items():
-                if not isinstance(payload, dict):
-                    _log.warning("Skipping invalid session entry for %s", session_key)
-                    continue
-                try:
-                    claude_session_id = str(payload["claude_session_id"])
-                    cwd = str(payload["cwd"])
-                    platform = str(payload["platform"])
-                    created_at = float(payload["created_at"])
-                    last_activity = float(payload["last_activity"])
-                    message_count = int(payload.get("message_count", 0))
-                except Exception as exc:
-                    _log.warning("Skipping invalid session entry for %s: %s", session_key, exc)
-                    continue
-                self._sessions[str(session_key)] = PersistedSession(
-                    claude_session_id=claude_session_id,
-                    cwd=cwd,
-                    platform=platform,
-                    created_at=created_at,
-                    last_activity=last_activity,
-                    message_count=message_count,
-                )
-            _log.info("Loaded %d persisted sessions from %s", len(self._sessions), self._path)
+    def _compact_unlocked(self) -> None:
+        """Fold the delta log into a fresh snapshot and truncate it."""
+        self._save_unlocked()
+        try:
+            if self._log_fd is not None:
+                os.ftruncate(self._log_fd, 0)
+            elif self._log_path.exists():
+                self._log_path.unlink()
+        except Exception as exc:
+            _log.error("Failed to truncate session store log: %s", exc)
+            return
+        self._log_lines = 0
+        self._log_dirty = False
 
     def save(self) -> None:
-        """Persist session data to disk (atomic)."""
+        """Persist session data to disk (atomic snapshot, log compacted)."""
         with self._lock:
-            self._save_unlocked()
+            self._compact_unlocked()
 
     def get(self, session_key: str) -> Optional[PersistedSession]:
-        """Lookup a persisted session."""
-        with self._lock:
-            result = self._sessions.get(session_key)
-            if result:
-                _log.info("Found persisted session for %s: session_id=%s", session_key, result.claude_session_id[:8] + "...")
-            else:
-                _log.debug("No persisted session for %s (available: %s)", session_key, list(self._sessions.keys()))
-            return result
+        """Lookup a persisted session (lock-free read of the current snapshot)."""
+        result = self._sessions.get(session_key)
+        if result:
+            _log.info("Found persisted session for %s: session_id=%s", session_key, result.claude_session_id[:8] + "...")
+        else:
+            _log.debug("No persisted session for %s (%d available)", session_key, len(self._sessions))
+        return result
 
     def update_session_id(
         self,
@@ -110,7 +287,7 @@ class SessionStore:
             existing = self._sessions.get(session_key)
             created_at = existing.created_at if existing else now
             message_count = (existing.message_count + 1) if existing else 1
-            self._sessions[session_key] = PersistedSession(
+            session = PersistedSession(
                 claude_session_id=claude_session_id,
                 cwd=cwd,
                 platform=platform,
@@ -118,54 +295,56 @@ class SessionStore:
                 last_activity=now,
                 message_count=message_count,
             )
-            self._save_unlocked()
+            entry = self._entry_dict(session)
+            new_sessions = dict(self._sessions)
+            new_sessions[session_key] = session
+            self._sessions = new_sessions
+            self._serialized[session_key] = entry
+            self._append_log_unlocked({"op": "upsert", "key": session_key, **entry})
 
     def remove(self, session_key: str) -> None:
         """Remove a persisted session entry."""
         with self._lock:
             if session_key in self._sessions:
-                self._sessions.pop(session_key, None)
-                self._save_unlocked()
+                new_sessions = dict(self._sessions)
+                new_sessions.pop(session_key, None)
+                self._sessions = new_sessions
+                self._serialized.pop(session_key, None)
+                self._append_log_unlocked({"op": "remove", "key": session_key})
 
     def cleanup_expired(self) -> int:
         """Remove sessions inactive for longer than the expiry window."""
         cutoff = time.time() - self._max_age_seconds
         with self._lock:
             expired = [key for key, sess in self._sessions.items() if sess.last_activity < cutoff]
-            for key in expired:
-                self._sessions.pop(key, None)
             if expired:
-                self._save_unlocked()
+                new_sessions = dict(self._sessions)
+                for key in expired:
+                    new_sessions.pop(key, None)
+                    self._serialized.pop(key, None)
+                self._sessions = new_sessions
+            if expired:
+                self._compact_unlocked()
             return len(expired)
 
     def _serialize(self) -> dict[str, object]:
-        return {
-            "version": _STORE_VERSION,
-            "sessions": {
-                key: {
-                    "claude_session_id": session.claude_session_id,
-                    "cwd": session.cwd,
-                    "platform": session.platform,
-                    "created_at": session.created_at,
-                    "last_activity": session.last_activity,
-                    "message_count": session.message_count,
-                }
-                for key, session in self._sessions.items()
-            },
-        }
+        return {"version": _STORE_VERSION, "sessions": self._serialized}
 
-    def _save_unlocked(self) -> None:
-        data = self._serialize()
+    def _snapshot_bytes(self) -> bytes:
+        """Serialize the current sessions; cheap enough to run under the lock."""
+        return _json_dumps(self._serialize())
+
+    def _write_bytes_atomic(self, blob: bytes) -> None:
+        """Blocking write+fsync+rename; safe to run off the event loop."""
         tmp_path: Optional[Path] = None
         try:
             self._path.parent.mkdir(parents=True, exist_ok=True)
             with tempfile.NamedTemporaryFile(
-                "w",
-                encoding="utf-8",
+                "wb",
                 dir=self._path.parent,
                 delete=False,
             ) as tmp_file:
-                json.dump(data, tmp_file, indent=2)
+                tmp_file.write(blob)
                 tmp_file.flush()
                 os.fsync(tmp_file.fileno())
                 tmp_path = Path(tmp_file.name)
@@ -178,5 +357,8 @@ class SessionStore:
                 except Exception:
                     pass
 
+    def _save_unlocked(self) -> None:
+        self._write_bytes_atomic(self._snapshot_bytes())
+
 
 session_store = SessionStore()
@@ -1,29 +1,43 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+import functools
+import sys
 import time
 from typing import Any, Protocol, runtime_checkable
 
 from platforms.protocol import ButtonRow, MessageRef, PlatformMessage
 
 
+@functools.lru_cache(maxsize=4096)
+def _telegram_key(chat_id: int | None, thread_id: int | None) -> str:
+    if thread_id:
+        return f"telegram:{chat_id}:{thread_id}"
+    return f"telegram:{chat_id}"
+
+
+@functools.lru_cache(maxsize=4096)
+def _discord_key(channel_id: int | None) -> str:
+    return f"discord:{channel_id}"
+
+
 def make_session_key(platform: str, **ids: int | None) -> str:
-    """Generate collision-free session key."""
+    """Generate collision-free session key.
+
+    Keys for a given chat are constant, so the formatted strings are
+    LRU-cached: repeat lookups reuse one interned str object instead of
+    allocating a fresh one per event.
+    """
     if platform == "telegram":
-        chat_id = ids["chat_id"]
-        thread_id = ids.get("thread_id")
-        if thread_id:
-            return f"telegram:{chat_id}:{thread_id}"
-        return f"telegram:{chat_id}"
+        return _telegram_key(ids["chat_id"], ids.get("thread_id"))
 
     if platform == "discord":
-        channel_id = ids["channel_id"]
-        return f"discord:{channel_id}"
+        return _discord_key(ids["channel_id"])
 
     raise ValueError(f"Unknown platform: {platform}")
 
 
-@dataclass
+@dataclass(slots=True)
 class Trigger:
     """Incoming event from any transport."""
 
@@ -33,9 +47,18 @@ class Trigger:
     images: list[str] = field(default_factory=list)
     reply_context: dict[str, Any] = field(default_factory=dict)
     source: str = "user"
+    # Filled in by the dispatcher: index into its listener registry, so
+    # platform dispatch is an array index rather than a dict probe.
+    platform_id: int = -1
+
+    def __post_init__(self) -> None:
+        # Interned keys make the dispatcher's per-message dict probes
+        # identity comparisons instead of full string hashes.
+        self.platform = sys.intern(self.platform)
+        self.session_key = sys.intern(self.session_key)
 
 
-@dataclass
+@dataclass(slots=True)
 class PersistedSession:
     """Session metadata for persistence."""
 
@@ -47,19 +70,35 @@ class PersistedSession:
     message_count: int = 0
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionStats:
     """Runtime statistics for a session."""
 
     created_at: float = field(default_factory=time.time)
-    last_activity: float = field(default_factory=time.time)
     message_count: int = 0
     turn_count: int = 0
     interrupt_count: int = 0
     error_count: int = 0
 
+    # Activity is tracked on the monotonic clock (no syscall on Linux and
+    # immune to wall-clock jumps); last_activity converts back lazily.
+    _created_mono: float = field(default_factory=time.monotonic)
+    _last_activity_mono: float = 0.0
+
+    def __post_init__(self) -> None:
+        self._last_activity_mono = self._created_mono
+
+    def touch(self) -> None:
+        """Record activity now."""
+        self._last_activity_mono = time.monotonic()
+
+    @property
+    def last_activity(self) -> float:
+        """Wall-clock timestamp of the most recent activity."""
+        return self.created_at + (self._last_activity_mono - self._created_mono)
+
 
-@dataclass
+@dataclass(slots=True)
 class ReplyCapabilities:
     """What this reply target supports."""
 
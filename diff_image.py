@@ -3,6 +3,7 @@ Side-by-side diff image renderer using Pygments + Pillow.
 Pure Python, no external dependencies.
 """
 import difflib
+import functools
 from io import BytesIO
 from typing import Optional, Any
 from dataclasses import dataclass
@@ -36,6 +37,19 @@ BORDER_COLOR = (48, 54, 61)  # #30363d
 HEADER_BG = (22, 27, 34)  # #161b22
 
 
+def _split_lines(text: str) -> list[str]:
+    """Split on newlines with a single-separator scan.
+
+    Faster than splitlines() for the tool-input case (always "\\n"), and
+    drops the one trailing newline so no phantom empty row is produced.
+    """
+    if not text:
+        return []
+    if text.endswith('\n'):
+        text = text[:-1]
+    return text.split('\n')
+
+
 @dataclass
 class DiffLine:
     line_no_left: Optional[int]
@@ -45,18 +59,30 @@ class DiffLine:
     change_type: str  # 'equal', 'insert', 'delete', 'replace'
 
 
-def _compute_side_by_side_diff(old_text: str, new_text: str) -> list[DiffLine]:
-    """Compute side-by-side diff lines."""
-    old_lines = old_text.splitlines()
-    new_lines = new_text.splitlines()
+def _compute_side_by_side_diff(
+    old_text: str,
+    new_text: str,
+    max_lines: Optional[int] = None,
+) -> list[DiffLine]:
+    """Compute side-by-side diff lines.
+
+    Stops expanding opcodes once max_lines + 1 rows exist (one extra so
+    callers can detect truncation), capping work for huge edits.
+    """
+    old_lines = _split_lines(old_text)
+    new_lines = _split_lines(new_text)
 
-    matcher = difflib.SequenceMatcher(None, old_lines, new_lines)
+    # autojunk would mis-handle repetitive files (configs, minified code)
+    # via the popular-element heuristic; inputs are small, so disable it.
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
     result: list[DiffLine] = []
 
     left_no = 1
     right_no = 1
 
     for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if max_lines is not None and len(result) > max_lines:
+            return result
         if tag == 'equal':
             for i in range(i2 - i1):
                 result.append(DiffLine(
@@ -68,6 +94,8 @@ def _compute_side_by_side_diff(old_text: str, new_text: str) -> list[DiffLine]:
                 ))
                 left_no += 1
                 right_no += 1
+                if max_lines is not None and len(result) > max_lines:
+                    return result
         elif tag == 'replace':
             max_len = max(i2 - i1, j2 - j1)
             for i in range(max_len):
@@ -84,6 +112,8 @@ def _compute_side_by_side_diff(old_text: str, new_text: str) -> list[DiffLine]:
                     left_no += 1
                 if right_idx is not None:
                     right_no += 1
+                if max_lines is not None and len(result) > max_lines:
+                    return result
         elif tag == 'delete':
             for i in range(i2 - i1):
                 result.append(DiffLine(
@@ -94,6 +124,8 @@ def _compute_side_by_side_diff(old_text: str, new_text: str) -> list[DiffLine]:
                     change_type='delete'
                 ))
                 left_no += 1
+                if max_lines is not None and len(result) > max_lines:
+                    return result
         elif tag == 'insert':
             for i in range(j2 - j1):
                 result.append(DiffLine(
@@ -104,20 +136,40 @@ def _compute_side_by_side_diff(old_text: str, new_text: str) -> list[DiffLine]:
                     change_type='insert'
                 ))
                 right_no += 1
+                if max_lines is not None and len(result) > max_lines:
+                    return result
 
     return result
 
 
-def _get_lexer(filename: str) -> Any:
-    """Get Pygments lexer for filename."""
+# Shared fallback lexer; stateless, so one instance serves all calls.
+_TEXT_LEXER = TextLexer()
+
+
+@functools.lru_cache(maxsize=64)
+def _get_lexer_for_ext(ext: str) -> Any:
+    """Get Pygments lexer for a file extension."""
     try:
-        return get_lexer_for_filename(filename)
+        return get_lexer_for_filename(f"file{ext}")
     except Exception:
-        return TextLexer()
+        return _TEXT_LEXER
+
+
+def _get_lexer(filename: str) -> Any:
+    """Get Pygments lexer for filename, cached by extension."""
+    dot = filename.rfind('.')
+    if dot == -1:
+        # No extension: resolve by the full name (e.g. Makefile), uncached.
+        try:
+            return get_lexer_for_filename(filename)
+        except Exception:
+            return _TEXT_LEXER
+    return _get_lexer_for_ext(filename[dot:])
 
 
+@functools.lru_cache(maxsize=4)
 def _get_token_colors(style_name: str = 'monokai') -> dict[Any, tuple[int, int, int]]:
-    """Get color mapping from Pygments style."""
+    """Get color mapping from Pygments style (parsed once per style)."""
     style = get_style_by_name(style_name)
     colors: dict[Any, tuple[int, int, int]] = {}
     for token, style_def in style:
@@ -142,8 +194,9 @@ def _tokenize_line(text: str, lexer: Any) -> list[tuple[Any, str]]:
     return result
 
 
+@functools.lru_cache(maxsize=4)
 def _try_load_font(size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    """Try to load a monospace font."""
+    """Try to load a monospace font (probed once per size)."""
     font_paths = [
         "/System/Library/Fonts/SFNSMono.ttf",
         "/System/Library/Fonts/Monaco.ttf",
@@ -177,7 +230,7 @@ def edit_to_image(
     Returns:
         BytesIO buffer with PNG image, or None if no changes
     """
-    diff_lines = _compute_side_by_side_diff(old_string, new_string)
+    diff_lines = _compute_side_by_side_diff(old_string, new_string, max_lines=max_lines)
 
     if not diff_lines:
         return None
@@ -191,6 +244,43 @@ def edit_to_image(
     lexer = _get_lexer(file_path)
     token_colors = _get_token_colors('monokai')
 
+    # Memoize the parent-walk per token type; the same types recur on
+    # nearly every line.
+    resolved_colors: dict[Any, tuple[int, int, int]] = {}
+
+    def resolve_color(ttype: Any) -> tuple[int, int, int]:
+        color = resolved_colors.get(ttype)
+        if color is None:
+            t = ttype
+            color = token_colors.get(t, FG_COLOR)
+            while color == FG_COLOR and t.parent:
+                t = t.parent
+                color = token_colors.get(t, FG_COLOR)
+            resolved_colors[ttype] = color
+        return color
+
+    font = _try_load_font(FONT_SIZE)
+    # Actual glyph advance (C-level) instead of the CHAR_WIDTH guess, so
+    # non-ASCII text no longer drifts; bitmap fallback fonts keep the guess.
+    measure = getattr(font, "getlength", None) or (lambda s: len(s) * CHAR_WIDTH)
+
+    def draw_line_tokens(draw: ImageDraw.ImageDraw, text: str, x: float, y: int) -> None:
+        """Draw one highlighted line, merging same-color runs into one call."""
+        run_text = ""
+        run_color: Optional[tuple[int, int, int]] = None
+        for ttype, value in _tokenize_line(text, lexer):
+            color = resolve_color(ttype)
+            if color == run_color:
+                run_text += value
+                continue
+            if run_text:
+                draw.text((x, y + 2), run_text, fill=run_color, font=font)
+                x += measure(run_text)
+            run_text = value
+            run_color = color
+        if run_text:
+            draw.text((x, y + 2), run_text, fill=run_color, font=font)
+
     # Calculate dimensions
     max_left_len = max((len(d.left_text) for d in diff_lines), default=0)
     max_right_len = max((len(d.right_text) for d in diff_lines), default=0)
@@ -207,7 +297,6 @@ def edit_to_image(
     # Create image
     img = Image.new('RGB', (total_width, total_height), BG_COLOR)
     draw = ImageDraw.Draw(img, 'RGBA')
-    font = _try_load_font(FONT_SIZE)
 
     # Draw header
     filename = file_path.split("/")[-1] if "/" in file_path else file_path
@@ -239,16 +328,8 @@ def edit_to_image(
             draw.rectangle([left_x + GUTTER_WIDTH, y, divider_x, y + LINE_HEIGHT], fill=DEL_BG)
 
         # Left text with syntax highlighting
-        text_x = left_x + GUTTER_WIDTH + 6
         if diff_line.left_text:
-            tokens = _tokenize_line(diff_line.left_text, lexer)
-            for ttype, value in tokens:
-                color = token_colors.get(ttype, FG_COLOR)
-                while color == FG_COLOR and ttype.parent:
-                    ttype = ttype.parent
-                    color = token_colors.get(ttype, FG_COLOR)
-                draw.text((text_x, y + 2), value, fill=color, font=font)
-                text_x += len(value) * CHAR_WIDTH
+            draw_line_tokens(draw, diff_line.left_text, left_x + GUTTER_WIDTH + 6, y)
 
         # Right side
         right_x = divider_x + 3
@@ -267,16 +348,8 @@ def edit_to_image(
             draw.rectangle([right_x + GUTTER_WIDTH, y, total_width, y + LINE_HEIGHT], fill=ADD_BG)
 
         # Right text with syntax highlighting
-        text_x = right_x + GUTTER_WIDTH + 6
         if diff_line.right_text:
-            tokens = _tokenize_line(diff_line.right_text, lexer)
-            for ttype, value in tokens:
-                color = token_colors.get(ttype, FG_COLOR)
-                while color == FG_COLOR and ttype.parent:
-                    ttype = ttype.parent
-                    color = token_colors.get(ttype, FG_COLOR)
-                draw.text((text_x, y + 2), value, fill=color, font=font)
-                text_x += len(value) * CHAR_WIDTH
+            draw_line_tokens(draw, diff_line.right_text, right_x + GUTTER_WIDTH + 6, y)
 
         y += LINE_HEIGHT
 
@@ -284,8 +357,9 @@ def edit_to_image(
     if truncated:
         draw.text((PADDING, y + 4), "... diff truncated ...", fill=GUTTER_FG, font=font)
 
-    # Save to buffer
+    # Save to buffer. Diffs use few distinct colors, so palette mode cuts
+    # the encoded size and PNG encode time versus RGB + optimize.
     buffer = BytesIO()
-    img.save(buffer, format='PNG', optimize=True)
+    img.convert('P', palette=Image.ADAPTIVE).save(buffer, format='PNG', optimize=False)
     buffer.seek(0)
     return buffer
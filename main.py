@@ -18,47 +18,67 @@ from typing import Any
 
 
 async def _run_dispatcher(*, enable_telegram: bool, enable_discord: bool, local_cwd: Path | None) -> None:
-    from dotenv import load_dotenv
     from core.dispatcher import Dispatcher
     from task_api import start_task_api, stop_task_api
 
+    # dotenv is imported only once the invocation is known to need it, so
+    # invalid-path errors below don't pay its import cost first. Each path
+    # is checked with a single os.stat rather than exists()/is_dir() pairs.
     if local_cwd is not None:
+        import os
+        import stat
+
         env_file = local_cwd / ".env.telebot"
-        if not local_cwd.exists():
+        try:
+            cwd_st = os.stat(local_cwd)
+        except OSError:
+            cwd_st = None
+        if cwd_st is None or not stat.S_ISDIR(cwd_st.st_mode):
             print(f"Error: Directory does not exist: {local_cwd}", file=sys.stderr)
             sys.exit(1)
-        if env_file.exists():
-            load_dotenv(env_file, override=True)
-        else:
+        try:
+            os.stat(env_file)
+        except OSError:
             print(f"Error: {env_file} not found", file=sys.stderr)
             print(f"Create .env.telebot in {local_cwd} with BOT_TOKEN=...", file=sys.stderr)
             sys.exit(1)
+        from dotenv import load_dotenv
+
+        load_dotenv(env_file, override=True)
     else:
+        from dotenv import load_dotenv
+
         load_dotenv()
 
+    # config parses the environment once at first import (module cache plus
+    # its own dotenv/env-snapshot guards); the frozen CONFIG instance covers
+    # the task-API settings in one symbol.
     from config import (
         BOT_TOKEN,
         DISCORD_BOT_TOKEN,
         ALLOWED_CHATS,
         DISCORD_ALLOWED_GUILDS,
-        TASK_API_HOST,
-        TASK_API_PORT,
+        CONFIG,
     )
-    from platforms.telegram.listener import TelegramListener
-    from platforms.discord.listener import DiscordListener
 
     dispatcher = Dispatcher()
 
+    # Import each platform stack only when its listener is actually enabled:
+    # `main.py telegram` should not pay for discord.py and vice versa.
     if enable_telegram and BOT_TOKEN:
+        from platforms.telegram.listener import TelegramListener
+
         dispatcher.add_listener(TelegramListener(BOT_TOKEN, ALLOWED_CHATS, local_cwd=str(local_cwd) if local_cwd else None))
     if enable_discord and DISCORD_BOT_TOKEN:
+        from platforms.discord.listener import DiscordListener
+
         dispatcher.add_listener(DiscordListener(DISCORD_BOT_TOKEN, DISCORD_ALLOWED_GUILDS))
 
-    if not dispatcher.sessions and not dispatcher.get_listener("telegram") and not dispatcher.get_listener("discord"):
+    if not dispatcher.sessions and not dispatcher.has_listeners:
         print("No listeners configured. Check BOT_TOKEN / DISCORD_BOT_TOKEN.", file=sys.stderr)
         sys.exit(1)
 
-    await start_task_api(dispatcher, host=TASK_API_HOST, port=TASK_API_PORT)
+    await start_task_api(dispatcher, host=CONFIG.task_api_host, port=CONFIG.task_api_port)
     await dispatcher.start()
 
     try:
@@ -70,42 +90,77 @@ async def _run_dispatcher(*, enable_telegram: bool, enable_discord: bool, local_
         await stop_task_api()
 
 
-async def _task_api_request(method: str, path: str, payload: dict[str, Any] | None = None) -> Any:
-    from aiohttp import ClientSession
-    from config import TASK_API_HOST, TASK_API_PORT
+def _task_api_request(method: str, path: str, payload: dict[str, Any] | None = None) -> Any:
+    """One-shot synchronous task-API request.
+
+    The sessions subcommands make exactly one local HTTP call each, so
+    stdlib http.client avoids both the aiohttp import and the cost of
+    spinning up an event loop for a single request. The connection is
+    kept open for the process lifetime, so any follow-up request in the
+    same invocation reuses it.
+    """
+    import http.client
 
-    url = f"http://{TASK_API_HOST}:{TASK_API_PORT}{path}"
-    async with ClientSession() as session:
-        async with session.request(method, url, json=payload) as resp:
-            data = await resp.json()
-            return resp.status, data
+    from config import CONFIG
+
+    # Body-less requests (GET /sessions) skip serialization entirely and
+    # send no Content-Type header, matching plain HTTP GET semantics.
+    body = json.dumps(payload).encode("utf-8") if payload is not None else None
+    headers = {"Content-Type": "application/json"} if body is not None else {}
+    conn = _get_api_connection(http.client, CONFIG.task_api_host, CONFIG.task_api_port)
+    conn.request(method, path, body, headers)
+    resp = conn.getresponse()
+    data = json.loads(resp.read() or b"null")
+    return resp.status, data
+
+
+_API_CONNECTION: Any = None
+
+
+def _get_api_connection(http_client: Any, host: str, port: int) -> Any:
+    global _API_CONNECTION
+    if _API_CONNECTION is None:
+        _API_CONNECTION = http_client.HTTPConnection(host, port)
+    return _API_CONNECTION
 
 
 def _print_json(data: Any) -> None:
-    print(json.dumps(data, indent=2, sort_keys=True))
+    try:
+        # Rust-backed encoder when available; big session dumps serialize
+        # several times faster than stdlib json.
+        import orjson
 
+        print(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode())
+    except ImportError:
+        print(json.dumps(data, indent=2, sort_keys=True))
 
-def main() -> None:
-    parser = argparse.ArgumentParser(
-        description="Claude Code Bot - Bridge chat platforms to Claude Agent SDK"
-    )
-    subparsers = parser.add_subparsers(dest="command", required=True)
 
-    run_parser = subparsers.add_parser("run", help="Run all available listeners")
+def _add_run_parser(subparsers: Any) -> None:
+    subparsers.add_parser("run", help="Run all available listeners")
+
 
+def _add_telegram_parser(subparsers: Any) -> None:
     tg_parser = subparsers.add_parser("telegram", help="Run Telegram listener")
     tg_parser.add_argument(
         "--local", nargs="?", const=".", default=None, metavar="PATH",
         help="Local project mode: anchor to PATH (default: CWD), use .env.telebot",
     )
 
+
+def _add_discord_parser(subparsers: Any) -> None:
     subparsers.add_parser("discord", help="Run Discord listener")
 
-    sessions_parser = subparsers.add_parser("sessions", help="Manage sessions via task API")
-    sessions_sub = sessions_parser.add_subparsers(dest="action", required=True)
+
+def _add_sessions_list_parser(sessions_sub: Any) -> None:
     sessions_sub.add_parser("list", help="List active sessions")
+
+
+def _add_sessions_get_parser(sessions_sub: Any) -> None:
     get_parser = sessions_sub.add_parser("get", help="Get session details")
     get_parser.add_argument("key", help="Session key (e.g., telegram:123:456)")
+
+
+def _add_sessions_inject_parser(sessions_sub: Any) -> None:
     inject_parser = sessions_sub.add_parser("inject", help="Inject a prompt")
     inject_parser.add_argument("prompt", help="Prompt to inject")
     inject_parser.add_argument("--key", dest="session_key")
@@ -115,47 +170,86 @@ def main() -> None:
     inject_parser.add_argument("--channel-id", type=int)
     inject_parser.add_argument("--topic-name", type=str)
 
-    args = parser.parse_args()
 
-    if args.command == "run":
-        asyncio.run(_run_dispatcher(enable_telegram=True, enable_discord=True, local_cwd=None))
-        return
+_SESSIONS_ACTION_BUILDERS = {
+    "list": _add_sessions_list_parser,
+    "get": _add_sessions_get_parser,
+    "inject": _add_sessions_inject_parser,
+}
 
-    if args.command == "telegram":
-        local = Path(args.local).resolve() if args.local is not None else None
-        asyncio.run(_run_dispatcher(enable_telegram=True, enable_discord=False, local_cwd=local))
-        return
 
-    if args.command == "discord":
-        asyncio.run(_run_dispatcher(enable_telegram=False, enable_discord=True, local_cwd=None))
-        return
+def _add_sessions_parser(subparsers: Any) -> None:
+    sessions_parser = subparsers.add_parser("sessions", help="Manage sessions via task API")
+    sessions_sub = sessions_parser.add_subparsers(dest="action", required=True)
+    # Same argv sniff as the top level, one position deeper: `sessions list`
+    # should not pay for inject's eight add_argument calls.
+    action = sys.argv[2] if len(sys.argv) > 2 and sys.argv[1] == "sessions" else None
+    builder = _SESSIONS_ACTION_BUILDERS.get(action) if action else None
+    if builder is not None:
+        builder(sessions_sub)
+    else:
+        for build in _SESSIONS_ACTION_BUILDERS.values():
+            build(sessions_sub)
 
-    if args.command == "sessions":
-        if args.action == "list":
-            status, data = asyncio.run(_task_api_request("GET", "/sessions"))
-            _print_json({"status": status, "data": data})
-            return
-        if args.action == "get":
-            status, data = asyncio.run(_task_api_request("GET", f"/sessions/{args.key}"))
-            _print_json({"status": status, "data": data})
-            return
-        if args.action == "inject":
-            payload: dict[str, Any] = {"prompt": args.prompt}
-            if args.session_key:
-                payload["session_key"] = args.session_key
-            if args.platform:
-                payload["platform"] = args.platform
-            if args.chat_id is not None:
-                payload["chat_id"] = args.chat_id
-            if args.thread_id is not None:
-                payload["thread_id"] = args.thread_id
-            if args.channel_id is not None:
-                payload["channel_id"] = args.channel_id
-            if args.topic_name:
-                payload["topic_name"] = args.topic_name
-            status, data = asyncio.run(_task_api_request("POST", "/inject", payload))
+
+_SUBPARSER_BUILDERS = {
+    "run": _add_run_parser,
+    "telegram": _add_telegram_parser,
+    "discord": _add_discord_parser,
+    "sessions": _add_sessions_parser,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Claude Code Bot - Bridge chat platforms to Claude Agent SDK"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Build only the subparser the invocation actually names; the full tree
+    # (needed for --help and error listings) is built on any other input.
+    cmd = sys.argv[1] if len(sys.argv) > 1 else None
+    builder = _SUBPARSER_BUILDERS.get(cmd) if cmd else None
+    if builder is not None:
+        builder(subparsers)
+    else:
+        for build in _SUBPARSER_BUILDERS.values():
+            build(subparsers)
+
+    args = parser.parse_args()
+
+    match args.command:
+        case "run":
+            asyncio.run(_run_dispatcher(enable_telegram=True, enable_discord=True, local_cwd=None))
+        case "telegram":
+            local = Path(args.local).resolve() if args.local is not None else None
+            asyncio.run(_run_dispatcher(enable_telegram=True, enable_discord=False, local_cwd=local))
+        case "discord":
+            asyncio.run(_run_dispatcher(enable_telegram=False, enable_discord=True, local_cwd=None))
+        case "sessions":
+            match args.action:
+                case "list":
+                    status, data = _task_api_request("GET", "/sessions")
+                case "get":
+                    status, data = _task_api_request("GET", f"/sessions/{args.key}")
+                case "inject":
+                    payload: dict[str, Any] = {"prompt": args.prompt}
+                    if args.session_key:
+                        payload["session_key"] = args.session_key
+                    if args.platform:
+                        payload["platform"] = args.platform
+                    if args.chat_id is not None:
+                        payload["chat_id"] = args.chat_id
+                    if args.thread_id is not None:
+                        payload["thread_id"] = args.thread_id
+                    if args.channel_id is not None:
+                        payload["channel_id"] = args.channel_id
+                    if args.topic_name:
+                        payload["topic_name"] = args.topic_name
+                    status, data = _task_api_request("POST", "/inject", payload)
+                case _:
+                    return
             _print_json({"status": status, "data": data})
-            return
 
 
 if __name__ == "__main__":
@@ -4,20 +4,55 @@ MCP tools for platform integration.
 Provides custom tools that Claude can use to interact with chat platforms,
 such as sending files to the chat.
 """
+import functools
+import os
+import stat as stat_module
 import tempfile
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-from claude_agent_sdk import create_sdk_mcp_server, tool
-
 if TYPE_CHECKING:
     from session import ClaudeSession
 
+# claude_agent_sdk is heavy and only needed once a Claude session actually
+# starts; bind it on first server creation so importing this module (e.g.
+# for path validation) stays cheap.
+_sdk_tool: Any = None
+_sdk_create_server: Any = None
+
+
+def _sdk() -> tuple[Any, Any]:
+    global _sdk_tool, _sdk_create_server
+    if _sdk_tool is None:
+        from claude_agent_sdk import create_sdk_mcp_server, tool
+
+        _sdk_tool = tool
+        _sdk_create_server = create_sdk_mcp_server
+    return _sdk_tool, _sdk_create_server
+
 # File size limit - 50 MB (Telegram limit; Discord is 25MB for non-Nitro)
 FILE_SIZE_LIMIT = 50 * 1024 * 1024
 
+# The temp dir never changes for the process lifetime; resolving it per tool
+# call would re-do env lookups and stat syscalls.
+_TEMP_DIR: Path = Path(tempfile.gettempdir()).resolve()
+_TEMP_DIR_STR = str(_TEMP_DIR)
+_TEMP_DIR_PREFIX = _TEMP_DIR_STR + os.sep
+
+
+@functools.lru_cache(maxsize=64)
+def _resolved_cwd(cwd: str) -> tuple[Path, str, str]:
+    """Resolve a session cwd once; the same string repeats across tool calls.
 
-def validate_file_path(file_path: str, cwd: str) -> tuple[bool, str, Path]:
+    Returns the resolved Path plus its string form and sep-terminated prefix
+    for cheap containment checks.
+    """
+    resolved = Path(cwd).resolve()
+    resolved_str = str(resolved)
+    return resolved, resolved_str, resolved_str + os.sep
+
+
+def validate_file_path(file_path: str, cwd: str) -> tuple[bool, str, Path, int]:
     """Validate and resolve file path for security.
 
     Ensures the file:
@@ -29,10 +64,12 @@ def validate_file_path(file_path: str, cwd: str) -> tuple[bool, str, Path]:
         cwd: Session's working directory
 
     Returns:
-        Tuple of (is_valid, error_message, resolved_path)
+        Tuple of (is_valid, error_message, resolved_path, size_bytes).
+        The size comes from the validation stat, so callers never need a
+        second stat syscall; it is 0 when validation fails.
     """
     path = Path(file_path)
-    cwd_path = Path(cwd).resolve()
+    cwd_path, cwd_str, cwd_prefix = _resolved_cwd(cwd)
 
     # Resolve relative paths against cwd
     if not path.is_absolute():
@@ -40,20 +77,30 @@ def validate_file_path(file_path: str, cwd: str) -> tuple[bool, str, Path]:
 
     resolved = path.resolve()
 
-    # Check file exists
-    if not resolved.exists():
-        return False, f"File not found: {file_path}", resolved
-
-    if not resolved.is_file():
-        return False, f"Not a file: {file_path}", resolved
+    # One stat covers both the existence and regular-file checks (exists() +
+    # is_file() would each issue their own syscall).
+    try:
+        st = os.stat(resolved)
+    except OSError:
+        return False, f"File not found: {file_path}", resolved, 0
 
-    # Security check: file must be within cwd or temp directory
-    temp_dir = Path(tempfile.gettempdir()).resolve()
+    if not stat_module.S_ISREG(st.st_mode):
+        return False, f"Not a file: {file_path}", resolved, 0
 
-    if not (resolved.is_relative_to(cwd_path) or resolved.is_relative_to(temp_dir)):
-        return False, "Access denied: file must be within project directory or temp folder", resolved
+    # Security check: file must be within cwd or temp directory. Both sides
+    # are resolved absolute paths, so a prefix check (with a trailing sep so
+    # /tmp2 does not match /tmp) is equivalent to is_relative_to and avoids
+    # its exception-driven parts walk.
+    resolved_str = str(resolved)
+    if not (
+        resolved_str == cwd_str
+        or resolved_str.startswith(cwd_prefix)
+        or resolved_str == _TEMP_DIR_STR
+        or resolved_str.startswith(_TEMP_DIR_PREFIX)
+    ):
+        return False, "Access denied: file must be within project directory or temp folder", resolved, 0
 
-    return True, "", resolved
+    return True, "", resolved, st.st_size
 
 
 def create_telegram_mcp_server(session: "ClaudeSession"):
@@ -68,6 +115,15 @@ def create_telegram_mcp_server(session: "ClaudeSession"):
     Returns:
         McpSdkServerConfig ready to use with ClaudeAgentOptions.mcp_servers
     """
+    # The server config is stable for a session's lifetime; rebuilding it on
+    # every query re-runs the @tool schema generation for nothing. Caching on
+    # the session itself ties the memo to the session's lifetime — no id()
+    # keyed dict to leak or collide.
+    cached = getattr(session, "_mcp_server", None)
+    if cached is not None:
+        return cached
+
+    tool, create_sdk_mcp_server = _sdk()
 
     @tool(
         "send_file",
@@ -93,15 +149,14 @@ def create_telegram_mcp_server(session: "ClaudeSession"):
             }
 
         # Validate and resolve file path
-        is_valid, error_msg, resolved_path = validate_file_path(file_path, session.cwd)
+        is_valid, error_msg, resolved_path, file_size = validate_file_path(file_path, session.cwd)
         if not is_valid:
             return {
                 "content": [{"type": "text", "text": f"Error: {error_msg}"}],
                 "is_error": True
             }
 
-        # Check file size
-        file_size = resolved_path.stat().st_size
+        # Size comes from the validation stat - no second syscall needed.
         if file_size > FILE_SIZE_LIMIT:
             size_mb = file_size / 1024 / 1024
             return {
@@ -125,12 +180,16 @@ def create_telegram_mcp_server(session: "ClaudeSession"):
                 "size_bytes": file_size
             })
 
+        # Build the arguments up front so only the network call sits in the
+        # try block — the handler should fire for I/O errors alone.
+        send_kwargs = {
+            "path": str(resolved_path),
+            "caption": caption or None,
+        }
+
         # Send the document using platform abstraction
         try:
-            result = await platform.send_document(
-                path=str(resolved_path),
-                caption=caption if caption else None,
-            )
+            result = await platform.send_document(**send_kwargs)
 
             # Log success
             if session.logger:
@@ -159,8 +218,13 @@ def create_telegram_mcp_server(session: "ClaudeSession"):
                 "is_error": True
             }
 
-    return create_sdk_mcp_server(
+    server = create_sdk_mcp_server(
         name="chat-tools",
         version="1.0.0",
         tools=[send_file]
     )
+    try:
+        session._mcp_server = server
+    except AttributeError:
+        pass
+    return server
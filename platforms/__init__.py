@@ -12,7 +12,7 @@ from .protocol import (
     PlatformMessage,
 )
 
-__all__ = [
+__all__ = (
     "ButtonSpec",
     "ButtonRow",
     "MessageRef",
@@ -22,4 +22,4 @@ __all__ = [
     "ToolCallMessage",
     "ThinkingMessage",
     "PlatformMessage",
-]
+)
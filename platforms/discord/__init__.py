@@ -2,12 +2,29 @@
 
 Handlers are NOT exported here to avoid circular imports.
 Import directly: from platforms.discord.handlers import ...
+
+Submodules are imported lazily: callers that only need DiscordClient
+never pay for the formatter's markdown/regex machinery (and vice versa).
 """
 
-from .client import DiscordClient
-from .formatter import DiscordFormatter
+import importlib
+
+_LAZY = {
+    "DiscordClient": ".client",
+    "DiscordFormatter": ".formatter",
+}
+
+__all__ = ("DiscordClient", "DiscordFormatter")
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    attr = getattr(importlib.import_module(module_name, __package__), name)
+    globals()[name] = attr
+    return attr
+
 
-__all__ = [
-    "DiscordClient",
-    "DiscordFormatter",
-]
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -13,7 +13,7 @@ import asyncio
 import logging
 import time
 from io import BytesIO
-from typing import Optional, Protocol, runtime_checkable
+from typing import Optional, Protocol
 
 import discord
 
@@ -33,12 +33,25 @@ _log = logging.getLogger("tele-claude.discord.client")
 
 # Rate limiting constants
 MIN_SEND_INTERVAL = 1.0  # Minimum seconds between sends (prevent burst)
+MAX_SEND_INTERVAL = 8.0  # Ceiling for AIMD backoff after repeated 429s
+SEND_BURST_CAPACITY = 3  # Token bucket size: short bursts pass without sleeping
+AIMD_BACKOFF_FACTOR = 1.5  # Interval multiplier on discord.RateLimited
+AIMD_RECOVERY_RUN = 8  # Successful sends before easing the interval back down
+AIMD_RECOVERY_STEP = 0.1  # Seconds shaved off the interval per recovery
 TYPING_ACTION_INTERVAL = 8.0  # Discord typing lasts ~10 seconds
+EDIT_COALESCE_INTERVAL = 1.0  # Max one edit API call per second while streaming
+
+# Texts above this size get rendered/split in a worker thread so the event
+# loop isn't blocked; smaller ones stay inline to skip the thread hop.
+OFFLOAD_RENDER_BYTES = 8192
 
 
-@runtime_checkable
 class ErrorLogger(Protocol):
-    """Protocol for error logging capability."""
+    """Protocol for error logging capability.
+
+    Static typing only — callers duck-type via a truthy check, so there is
+    no runtime_checkable isinstance machinery to pay for.
+    """
 
     def log_error(self, context: str, error: Exception) -> None:
         """Log an error with context."""
@@ -53,6 +66,12 @@ class DiscordClient(PlatformClient):
     - Typing indicators
     - File/image sending
     - Button interactions via Views
+
+    All instances ride the bot's single shared HTTP session (via the
+    channel's connection state), so per-channel clients cost no extra
+    TCP/TLS handshakes. Never construct an independent aiohttp session
+    here — it would fork the connection pool and discord.py's rate-limit
+    bookkeeping along with it.
     """
 
     def __init__(
@@ -64,10 +83,35 @@ class DiscordClient(PlatformClient):
         self._logger = logger
         self._formatter = DiscordFormatter()
 
-        # Rate limiting state
-        self._last_send = 0.0
-        self._send_interval = MIN_SEND_INTERVAL
-        self._last_typing = 0.0
+        # Rate limiting state: token bucket. A full bucket lets a short
+        # burst of sends go out back-to-back; sustained traffic drains it
+        # and is paced at one send per MIN_SEND_INTERVAL.
+        self._tokens = float(SEND_BURST_CAPACITY)
+        self._capacity = float(SEND_BURST_CAPACITY)
+        self._refill_rate = 1.0 / MIN_SEND_INTERVAL  # tokens per second
+        self._last_refill = time.monotonic()
+        # AIMD: widen the pace multiplicatively on 429s, narrow it
+        # additively after a run of clean sends, so throughput converges on
+        # what Discord actually accepts instead of a guessed constant.
+        self._success_run = 0
+        self._typing_next = 0.0  # Monotonic deadline for the next typing action
+
+        # Streaming edit coalescing, keyed per target message: edits to the
+        # same message replace each other inside the window so only the
+        # latest render reaches the API, while edits to different messages
+        # (session.py interleaves the response and tool-batch refs) are all
+        # flushed rather than overwriting one another.
+        self._pending_edits: dict[
+            int, tuple[MessageRef, PlatformMessage, Optional[list[ButtonRow]]]
+        ] = {}
+        self._edit_flush_task: Optional[asyncio.Task] = None
+
+        # Last split_text result, keyed by the exact text. Repeated renders
+        # of the same string skip the boundary scan; comparing the string
+        # itself (pointer check first, then bytes) is cheap and exact,
+        # where a length+prefix fingerprint could collide and serve the
+        # previous message's chunks.
+        self._split_cache: Optional[tuple[str, list[str]]] = None
 
     @property
     def max_message_length(self) -> int:
@@ -106,12 +150,64 @@ class DiscordClient(PlatformClient):
 
         return view
 
+    def _refill_tokens(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity,
+            self._tokens + (now - self._last_refill) * self._refill_rate,
+        )
+        self._last_refill = now
+
     async def _apply_rate_limit(self) -> None:
-        """Wait if necessary to respect rate limits."""
-        now = time.time()
-        elapsed = now - self._last_send
-        if elapsed < self._send_interval:
-            await asyncio.sleep(self._send_interval - elapsed)
+        """Take a send token, sleeping only when the bucket is empty.
+
+        The token is debited *before* any await, so N concurrent callers
+        reserve N distinct slots atomically (the balance goes negative and
+        each sleeps out its own deficit) instead of serializing behind a
+        single post-send timestamp.
+        """
+        self._refill_tokens()
+        self._tokens -= 1.0
+        if self._tokens < 0.0:
+            await asyncio.sleep(-self._tokens / self._refill_rate)
+
+    def _on_rate_limited(self, retry_after: float = 0.0) -> None:
+        """Multiplicative backoff: widen the send interval after a 429.
+
+        When Discord supplied a Retry-After window, honor it directly: the
+        pace drops to at least that interval and the bucket is drained so
+        the next sender sleeps the window out instead of retrying into
+        another 429.
+        """
+        interval = min(MAX_SEND_INTERVAL, (1.0 / self._refill_rate) * AIMD_BACKOFF_FACTOR)
+        if retry_after > 0.0:
+            interval = min(MAX_SEND_INTERVAL, max(interval, retry_after))
+        self._refill_rate = 1.0 / interval
+        if retry_after > 0.0:
+            self._refill_tokens()
+            self._tokens = min(self._tokens, 1.0 - retry_after * self._refill_rate)
+        self._success_run = 0
+
+    def _on_send_success(self) -> None:
+        """Additive recovery: ease the interval back down after clean sends."""
+        self._success_run += 1
+        if self._success_run >= AIMD_RECOVERY_RUN:
+            interval = max(MIN_SEND_INTERVAL, (1.0 / self._refill_rate) - AIMD_RECOVERY_STEP)
+            self._refill_rate = 1.0 / interval
+            self._success_run = 0
+
+    def _render_and_split(self, message: PlatformMessage) -> list[str]:
+        """Render a message and chunk it; safe to run off-loop."""
+        return self._cached_split(self._render_message(message))
+
+    def _cached_split(self, text: str) -> list[str]:
+        """split_text with a one-entry memo for repeated renders."""
+        cached = self._split_cache
+        if cached is not None and cached[0] == text:
+            return cached[1]
+        chunks = split_text(text, self.max_message_length)
+        self._split_cache = (text, chunks)
+        return chunks
 
     def _log_error(self, context: str, error: Exception) -> None:
         """Log error if logger is available."""
@@ -169,30 +265,53 @@ class DiscordClient(PlatformClient):
         else:
             return MessageRef(platform_data=None)
 
-        await self._apply_rate_limit()
-
-        text = self._render_message(message)
-        chunks = split_text(text, self.max_message_length)
+        if (
+            isinstance(message, (TextMessage, ThinkingMessage))
+            and len(message.text) > OFFLOAD_RENDER_BYTES
+        ):
+            chunks = await asyncio.to_thread(self._render_and_split, message)
+        else:
+            chunks = self._render_and_split(message)
         view = self._build_view(buttons)
-        msg = None
 
-        for i, chunk in enumerate(chunks):
-            is_last = i == len(chunks) - 1
+        async def _send_chunk(content: str, chunk_view: Optional[discord.ui.View] = None):
+            # Each chunk reserves its own token, so the bucket bounds the
+            # overall burst while the sends themselves overlap.
+            await self._apply_rate_limit()
+            if chunk_view is not None:
+                return await self._channel.send(content=content, view=chunk_view)
+            return await self._channel.send(content=content)
+
+        msg = None
+        if len(chunks) == 1:
             try:
-                if is_last and view:
-                    msg = await self._channel.send(content=chunk, view=view)
-                else:
-                    msg = await self._channel.send(content=chunk)
-                self._last_send = time.time()
+                msg = await _send_chunk(chunks[0], view)
+                self._on_send_success()
             except discord.RateLimited as e:
                 _log.warning("Rate limited on send_message: retry_after=%.1fs", e.retry_after)
                 self._log_error("send_message", e)
+                self._on_rate_limited(e.retry_after)
             except Exception as e:
                 self._log_error("send_message", e)
-
-            # Throttle between chunks to prevent burst
-            if not is_last:
-                await asyncio.sleep(MIN_SEND_INTERVAL)
+        else:
+            # Multi-chunk messages go out concurrently: wall-clock latency is
+            # ~1 RTT instead of N RTTs plus inter-chunk sleeps. Buttons stay
+            # on the last chunk, whose Message backs the returned ref.
+            head, last = chunks[:-1], chunks[-1]
+            coros = [_send_chunk(chunk) for chunk in head]
+            coros.append(_send_chunk(last, view))
+            results = await asyncio.gather(*coros, return_exceptions=True)
+            for result in results:
+                if isinstance(result, discord.RateLimited):
+                    _log.warning("Rate limited on send_message: retry_after=%.1fs", result.retry_after)
+                    self._log_error("send_message", result)
+                    self._on_rate_limited(result.retry_after)
+                elif isinstance(result, BaseException):
+                    self._log_error("send_message", result)
+                else:
+                    self._on_send_success()
+            if not isinstance(results[-1], BaseException):
+                msg = results[-1]
 
         return MessageRef(platform_data=msg)
 
@@ -203,7 +322,43 @@ class DiscordClient(PlatformClient):
         *,
         buttons: Optional[list[ButtonRow]] = None,
     ) -> None:
-        """Edit an existing message."""
+        """Edit an existing message (coalesced per message).
+
+        Stores the newest pending edit for this message and lets the flush
+        loop apply it: the first edit goes out immediately, later ones for
+        the same message inside the coalescing window replace each other so
+        only the latest render reaches the API. Edits to other messages
+        keep their own slot and are never dropped.
+        """
+        if not ref.platform_data:
+            return
+        self._pending_edits[id(ref.platform_data)] = (ref, message, buttons)
+        if self._edit_flush_task is None or self._edit_flush_task.done():
+            self._edit_flush_task = asyncio.create_task(self._flush_edits())
+
+    async def _flush_edits(self) -> None:
+        while self._pending_edits:
+            # One round flushes the newest render of every pending message
+            # (the token bucket paces the actual API calls). Edits arriving
+            # during the round land in the dict and are applied next round,
+            # after the coalescing sleep.
+            for key in list(self._pending_edits):
+                pending = self._pending_edits.pop(key, None)
+                if pending is None:
+                    continue
+                ref, message, buttons = pending
+                await self._do_edit(ref, message, buttons)
+            await asyncio.sleep(EDIT_COALESCE_INTERVAL)
+        # Stream went quiet: drop the memo so the finished message's text
+        # (and its chunk list) isn't pinned until the next send.
+        self._split_cache = None
+
+    async def _do_edit(
+        self,
+        ref: MessageRef,
+        message: PlatformMessage,
+        buttons: Optional[list[ButtonRow]] = None,
+    ) -> None:
         msg: Optional[discord.Message] = ref.platform_data
         if not msg:
             return
@@ -218,10 +373,10 @@ class DiscordClient(PlatformClient):
             else:
                 content = self._render_message(message)
                 await msg.edit(content=content, view=view)
-            self._last_send = time.time()
         except discord.RateLimited as e:
             _log.warning("Rate limited on edit_message: retry_after=%.1fs", e.retry_after)
             self._log_error("edit_message", e)
+            self._on_rate_limited(e.retry_after)
         except discord.NotFound:
             pass
         except Exception as e:
@@ -245,13 +400,15 @@ class DiscordClient(PlatformClient):
 
     async def send_typing(self) -> None:
         """Send typing indicator if enough time has passed."""
-        now = time.time()
-        if now - self._last_typing < TYPING_ACTION_INTERVAL:
+        # Deadline compare only: this runs per streamed update, so the
+        # common path is one monotonic read and one float comparison.
+        now = time.monotonic()
+        if now < self._typing_next:
             return
 
         try:
             await self._channel.typing()
-            self._last_typing = now
+            self._typing_next = now + TYPING_ACTION_INTERVAL
         except discord.RateLimited as e:
             _log.warning("Rate limited on send_typing: retry_after=%.1fs", e.retry_after)
         except Exception as e:
@@ -268,11 +425,11 @@ class DiscordClient(PlatformClient):
             image.seek(0)
             file = discord.File(image, filename="image.png")
             msg = await self._channel.send(content=caption, file=file)
-            self._last_send = time.time()
             return MessageRef(platform_data=msg)
         except discord.RateLimited as e:
             _log.warning("Rate limited on send_photo: retry_after=%.1fs", e.retry_after)
             self._log_error("send_photo", e)
+            self._on_rate_limited(e.retry_after)
             return MessageRef(platform_data=None)
         except Exception as e:
             self._log_error("send_photo", e)
@@ -288,6 +445,9 @@ class DiscordClient(PlatformClient):
 
         try:
             await self._apply_rate_limit()
+            # No buffer pooling here on purpose: the BytesIO objects are
+            # owned by the caller and discord.py closes each File after the
+            # send, so wrappers are inherently single-use.
             files = []
             for i, (img_buffer, caption) in enumerate(images):
                 img_buffer.seek(0)
@@ -295,10 +455,10 @@ class DiscordClient(PlatformClient):
 
             content = images[0][1] if images else None
             await self._channel.send(content=content, files=files)
-            self._last_send = time.time()
         except discord.RateLimited as e:
             _log.warning("Rate limited on send_photos: retry_after=%.1fs", e.retry_after)
             self._log_error("send_photos", e)
+            self._on_rate_limited(e.retry_after)
         except Exception as e:
             self._log_error("send_photos", e)
 
@@ -312,11 +472,11 @@ class DiscordClient(PlatformClient):
             await self._apply_rate_limit()
             file = discord.File(path)
             msg = await self._channel.send(content=caption, file=file)
-            self._last_send = time.time()
             return MessageRef(platform_data=msg)
         except discord.RateLimited as e:
             _log.warning("Rate limited on send_document: retry_after=%.1fs", e.retry_after)
             self._log_error("send_document", e)
+            self._on_rate_limited(e.retry_after)
             return MessageRef(platform_data=None)
         except Exception as e:
             self._log_error("send_document", e)
@@ -333,11 +493,11 @@ class DiscordClient(PlatformClient):
 
         try:
             msg = await self._channel.send(embed=embed)
-            self._last_send = time.time()
             return MessageRef(platform_data=msg)
         except discord.RateLimited as e:
             _log.warning("Rate limited on send_thinking: retry_after=%.1fs", e.retry_after)
             self._log_error("send_thinking", e)
+            self._on_rate_limited(e.retry_after)
             return MessageRef(platform_data=None)
         except Exception as e:
             self._log_error("send_thinking", e)
@@ -14,18 +14,22 @@ class DiscordFormatter(MessageFormatter):
     Discord natively supports Markdown, so most formatting is passthrough.
     """
 
+    # Built once: str.translate walks the text in a single C loop instead
+    # of one full copy per escaped character.
+    _ESCAPE_TABLE = str.maketrans({c: f'\\{c}' for c in '*_~`|>#@!'})
+    _ESCAPE_SET = frozenset('*_~`|>#@!')
+
     def format_markdown(self, text: str) -> str:
         """Discord uses markdown natively - passthrough."""
         return text
 
     def escape_text(self, text: str) -> str:
         """Escape Discord markdown special characters."""
-        # Discord markdown escapes
-        chars_to_escape = ['*', '_', '~', '`', '|', '>', '#', '@', '!']
-        result = text
-        for char in chars_to_escape:
-            result = result.replace(char, f'\\{char}')
-        return result
+        # Plain prose is the common case; return the original object
+        # untouched unless something actually needs escaping.
+        if self._ESCAPE_SET.isdisjoint(text):
+            return text
+        return text.translate(self._ESCAPE_TABLE)
 
     def bold(self, text: str) -> str:
         return f"**{text}**"
@@ -49,29 +53,30 @@ class DiscordFormatter(MessageFormatter):
 
     def format_tool_call(self, name: str, args: dict) -> str:
         """Format a tool call for display (Markdown)."""
-        parts = []
-        for k, v in args.items():
-            v_str = str(v)
-            if len(v_str) > 50:
-                v_str = v_str[:50] + "..."
-            v_str = self.escape_text(v_str)
-            parts.append(f"{k}={v_str}")
+        escape = self.escape_text
+        args_str = ", ".join(
+            f"{k}={escape(v_str if len(v_str) <= 50 else v_str[:50] + '...')}"
+            for k, v_str in ((k, str(v)) for k, v in args.items())
+        )
+        return f"🔧 **{name}**({args_str})"
 
-        args_str = ", ".join(parts) if parts else ""
-        return f"🔧 {self.bold(name)}({args_str})"
+    # Scan order for the most descriptive argument of a batched tool call.
+    _PRIORITY_KEYS = ('file_path', 'path', 'pattern', 'command', 'query', 'prompt', 'url')
+    _MISSING = object()
 
     def format_tool_calls_batch(self, tool_name: str, calls: list[tuple[str, dict]]) -> str:
         """Format multiple tool calls of same type (Markdown)."""
         items = []
         for name, input_dict in calls:
             key_arg = None
-            for key in ['file_path', 'path', 'pattern', 'command', 'query', 'prompt', 'url']:
-                if key in input_dict:
-                    key_arg = str(input_dict[key])
+            for key in self._PRIORITY_KEYS:
+                value = input_dict.get(key, self._MISSING)
+                if value is not self._MISSING:
+                    key_arg = str(value)
                     break
 
             if key_arg is None and input_dict:
-                key_arg = str(list(input_dict.values())[0])
+                key_arg = str(next(iter(input_dict.values())))
 
             if key_arg:
                 if len(key_arg) > 60:
@@ -93,31 +98,29 @@ def split_text(text: str, max_length: int = 2000) -> list[str]:
     """
     if len(text) <= max_length:
         return [text]
-    
+
+    # Fast path for newline- and space-free payloads (long tool output,
+    # base64 blobs): fixed-stride slicing, no boundary scans at all.
+    if '\n' not in text and ' ' not in text:
+        return [text[i:i + max_length] for i in range(0, len(text), max_length)]
+
+    # Single pass over offsets: rfind locates the latest newline (or space)
+    # inside the window and one slice emits the chunk, instead of rebuilding
+    # ever-longer strings line by line.
     chunks = []
-    current = ""
-    
-    for line in text.split('\n'):
-        if len(current) + len(line) + 1 <= max_length:
-            current = current + '\n' + line if current else line
-        else:
-            if current:
-                chunks.append(current)
-            # Handle lines longer than max_length
-            if len(line) > max_length:
-                words = line.split(' ')
-                current = ""
-                for word in words:
-                    if len(current) + len(word) + 1 <= max_length:
-                        current = current + ' ' + word if current else word
-                    else:
-                        if current:
-                            chunks.append(current)
-                        current = word[:max_length]  # Truncate very long words
-            else:
-                current = line
-    
-    if current:
-        chunks.append(current)
-    
+    start = 0
+    n = len(text)
+    while n - start > max_length:
+        cut = text.rfind('\n', start, start + max_length)
+        if cut <= start:
+            cut = text.rfind(' ', start, start + max_length)
+        if cut <= start:
+            # No boundary in the window: hard-split at the limit.
+            cut = start + max_length
+        chunks.append(text[start:cut])
+        if cut < n and text[cut] in '\n ':
+            cut += 1  # Drop the separator the chunk was cut at
+        start = cut
+    if start < n:
+        chunks.append(text[start:])
     return chunks
@@ -4,12 +4,19 @@ import asyncio
 import logging
 import os
 import tempfile
+import time
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Optional
 
 import discord
 
-from config import DISCORD_ALLOWED_GUILDS, PROJECTS_DIR
+from config import (
+    DISCORD_ALLOWED_GUILDS,
+    DISCORD_CHANNEL_PROJECTS,
+    PROJECTS_DIR,
+    bloom_contains,
+    bloom_mask,
+)
 from core.dispatcher import TransportListener
 from core.types import Trigger, make_session_key
 from utils import ensure_image_within_limits
@@ -17,33 +24,110 @@ from .reply_target import DiscordReplyTarget
 
 _log = logging.getLogger("tele-claude.discord.listener")
 
+# Lazily bound on first use: importing session at module level would be
+# circular, but re-running the import statement per event is wasted work.
+_session_module: Any = None
+
+
+def _session() -> Any:
+    global _session_module
+    if _session_module is None:
+        import session
+
+        _session_module = session
+    return _session_module
+
 
 def _normalize_name(name: str) -> str:
     """Normalize a name for matching: lowercase, replace _ and spaces with -."""
     return name.lower().replace("_", "-").replace(" ", "-")
 
 
-def resolve_project_for_channel(channel_name: str) -> Optional[str]:
-    """Resolve a project directory by matching channel name to a PROJECTS_DIR subfolder."""
-    if not PROJECTS_DIR.exists():
-        return None
-    normalized = _normalize_name(channel_name)
-    for d in PROJECTS_DIR.iterdir():
-        if d.is_dir() and not d.name.startswith(".") and _normalize_name(d.name) == normalized:
-            return str(d)
-    return None
-
-
-def _is_general_channel(channel: discord.abc.Messageable) -> bool:
-    """Check if channel is #general (ambient channel for home folder sessions)."""
-    if isinstance(channel, discord.Thread):
-        parent = channel.parent
-        if parent:
-            return parent.name.lower() == "general"
-        return False
-    if isinstance(channel, discord.TextChannel):
-        return channel.name.lower() == "general"
-    return False
+# Project-name cache: one iterdir pass builds {normalized name: full path},
+# then every message within the TTL resolves with a plain dict hit instead of
+# walking PROJECTS_DIR and re-normalizing each entry. New project folders show
+# up within _PROJECT_CACHE_TTL; a changed PROJECTS_DIR invalidates immediately.
+_PROJECT_CACHE_TTL = 30.0
+_project_cache: Optional[dict[str, str]] = None
+_project_cache_ts: float = 0.0
+_project_cache_dir: Optional[Path] = None
+
+
+def _build_project_cache() -> dict[str, str]:
+    """Walk PROJECTS_DIR once, mapping normalized directory names to paths."""
+    cache: dict[str, str] = {}
+    try:
+        entries = list(PROJECTS_DIR.iterdir())
+    except OSError:
+        return cache
+    for d in entries:
+        if d.is_dir() and not d.name.startswith("."):
+            cache[_normalize_name(d.name)] = str(d)
+    return cache
+
+
+def _get_project_cache() -> dict[str, str]:
+    global _project_cache, _project_cache_ts, _project_cache_dir
+    now = time.monotonic()
+    if (
+        _project_cache is None
+        or _project_cache_dir != PROJECTS_DIR
+        or now - _project_cache_ts > _PROJECT_CACHE_TTL
+    ):
+        _project_cache = _build_project_cache()
+        _project_cache_ts = now
+        _project_cache_dir = PROJECTS_DIR
+    return _project_cache
+
+
+async def _ensure_project_cache() -> None:
+    """Refresh the project-name cache in a worker thread if it is stale.
+
+    resolve_project_for_channel stays synchronous against the in-memory
+    dict; the async message handler calls this first so the iterdir
+    syscalls never block the event loop.
+    """
+    global _project_cache, _project_cache_ts, _project_cache_dir
+    projects_dir = PROJECTS_DIR
+    if (
+        _project_cache is not None
+        and _project_cache_dir == projects_dir
+        and time.monotonic() - _project_cache_ts <= _PROJECT_CACHE_TTL
+    ):
+        return
+    cache = await asyncio.to_thread(_build_project_cache)
+    _project_cache = cache
+    _project_cache_ts = time.monotonic()
+    _project_cache_dir = projects_dir
+
+
+def resolve_project_for_channel(channel_name: str, channel_id: Optional[int] = None) -> Optional[str]:
+    """Resolve a project directory by matching channel name to a PROJECTS_DIR subfolder.
+
+    An explicit DISCORD_CHANNEL_PROJECTS mapping takes precedence over
+    name matching when the channel id is known.
+    """
+    if channel_id is not None:
+        mapped = DISCORD_CHANNEL_PROJECTS.get(channel_id)
+        if mapped is not None:
+            return str(mapped)
+    return _get_project_cache().get(_normalize_name(channel_name))
+
+
+# Permission-button actions: action -> (allowed, always, success message).
+# One table drives the resolve_permission call and the edit_message text,
+# replacing three near-identical if/elif branches per button click.
+_PERM_ACTIONS: dict[str, tuple[bool, bool, str]] = {
+    "allow": (True, False, "✅ Allowed `{t}` (one-time)"),
+    "deny": (False, False, "❌ Denied `{t}`"),
+    "always": (True, True, "✅ Always allowed `{t}`"),
+}
+
+
+# Cap on messages concurrently downloading attachments. Each discord.py
+# event runs as its own task, so a burst of image posts would otherwise
+# fan out into unbounded downloads and temp-file image processing.
+_MAX_CONCURRENT_DOWNLOADS = 4
 
 
 class DiscordListener(TransportListener):
@@ -53,10 +137,17 @@ class DiscordListener(TransportListener):
 
     def __init__(self, bot_token: str, allowed_guilds: set[int] = DISCORD_ALLOWED_GUILDS) -> None:
         self._bot_token = bot_token
-        self._allowed_guilds = allowed_guilds
+        self._allowed_guilds = frozenset(allowed_guilds)
+        self._allowed_guilds_bloom = bloom_mask(self._allowed_guilds)
         self._on_trigger: Optional[Callable[[Trigger], Awaitable[None]]] = None
         self._client: Optional[discord.Client] = None
         self._task: Optional[asyncio.Task] = None
+        # channel/thread id -> (cwd, project-cache timestamp it derived from).
+        # Serves repeat messages in the same channel without re-walking the
+        # channel object graph or the project dict; rename/delete events and
+        # project-cache refreshes both invalidate.
+        self._channel_meta: dict[int, tuple[Optional[str], float]] = {}
+        self._download_sem = asyncio.Semaphore(_MAX_CONCURRENT_DOWNLOADS)
 
     def resolve_cwd(self, trigger: Trigger) -> Optional[str]:
         return trigger.reply_context.get("cwd")
@@ -88,7 +179,7 @@ class DiscordListener(TransportListener):
         return DiscordReplyTarget(client=self._client, channel=channel, channel_id=channel_id)
 
     async def create_session(self, trigger: Trigger, cwd: str) -> Any:
-        import session as session_module
+        session_module = _session()
 
         if not self._client:
             raise RuntimeError("DiscordListener not started")
@@ -114,12 +205,46 @@ class DiscordListener(TransportListener):
             raise RuntimeError("Failed to start Discord session")
         return session_module.sessions[channel.id]
 
+    def _channel_cwd(self, channel: Any) -> Optional[str]:
+        """Memoized working directory for a channel or thread.
+
+        Misses derive the cwd from the channel name (falling back to the
+        home dir for #general) and record it together with the current
+        project-cache timestamp, so a cache refresh re-derives stale
+        entries rather than pinning old answers.
+        """
+        cached = self._channel_meta.get(channel.id)
+        if cached is not None and cached[1] == _project_cache_ts:
+            return cached[0]
+        # Fetch the governing channel's name and id once; both the project
+        # lookup and the #general check run against these locals instead of
+        # traversing the channel graph twice.
+        if isinstance(channel, discord.Thread):
+            parent = channel.parent
+            name, source_id = (parent.name, parent.id) if parent else (None, None)
+        elif isinstance(channel, discord.TextChannel):
+            name, source_id = channel.name, channel.id
+        else:
+            name, source_id = None, None
+        cwd = resolve_project_for_channel(name, source_id) if name is not None else None
+        if cwd is None and name is not None and name.lower() == "general":
+            cwd = str(Path.home())
+        self._channel_meta[channel.id] = (cwd, _project_cache_ts)
+        return cwd
+
+    def invalidate_channel(self, channel_id: int) -> None:
+        """Drop the memoized cwd for a renamed or deleted channel."""
+        self._channel_meta.pop(channel_id, None)
+
     def _is_authorized_guild(self, guild_id: Optional[int]) -> bool:
-        if not self._allowed_guilds:
+        allowed = self._allowed_guilds
+        if not allowed:
             return True
-        if guild_id is None:
-            return False
-        return guild_id in self._allowed_guilds
+        return (
+            guild_id is not None
+            and bloom_contains(self._allowed_guilds_bloom, guild_id)
+            and guild_id in allowed
+        )
 
     async def _handle_message(self, message: discord.Message) -> None:
         if message.author.bot:
@@ -130,6 +255,10 @@ class DiscordListener(TransportListener):
         if not self._on_trigger:
             return
 
+        # Refresh the project cache off-loop before the channel branches
+        # below hit it; their resolve calls then never touch the disk.
+        await _ensure_project_cache()
+
         has_image = any(
             a.content_type and a.content_type.startswith("image/")
             for a in message.attachments
@@ -140,12 +269,7 @@ class DiscordListener(TransportListener):
 
         channel = message.channel
         if isinstance(channel, discord.Thread):
-            cwd = None
-            parent_name = channel.parent.name if channel.parent else None
-            if parent_name:
-                cwd = resolve_project_for_channel(parent_name)
-            if cwd is None and _is_general_channel(channel):
-                cwd = str(Path.home())
+            cwd = self._channel_cwd(channel)
 
             trigger = Trigger(
                 platform="discord",
@@ -163,9 +287,7 @@ class DiscordListener(TransportListener):
             return
 
         if isinstance(channel, discord.TextChannel):
-            cwd = resolve_project_for_channel(channel.name)
-            if cwd is None and _is_general_channel(channel):
-                cwd = str(Path.home())
+            cwd = self._channel_cwd(channel)
             if cwd is None:
                 return
 
@@ -192,19 +314,23 @@ class DiscordListener(TransportListener):
 
     async def _download_images(self, message: discord.Message) -> list[str]:
         images: list[str] = []
-        for attachment in message.attachments:
-            if not attachment.content_type or not attachment.content_type.startswith("image/"):
-                continue
-            suffix = os.path.splitext(attachment.filename)[1] or ".jpg"
-            temp_path = Path(tempfile.gettempdir()) / f"discord_{attachment.id}{suffix}"
-            await attachment.save(temp_path)
-            result_path = await asyncio.to_thread(ensure_image_within_limits, str(temp_path))
-            images.append(result_path)
+        # Bounded: excess messages wait here instead of flooding the network
+        # and the to_thread pool; the mailbox bound downstream handles any
+        # pile-up of the resulting triggers.
+        async with self._download_sem:
+            for attachment in message.attachments:
+                if not attachment.content_type or not attachment.content_type.startswith("image/"):
+                    continue
+                suffix = os.path.splitext(attachment.filename)[1] or ".jpg"
+                temp_path = Path(tempfile.gettempdir()) / f"discord_{attachment.id}{suffix}"
+                await attachment.save(temp_path)
+                result_path = await asyncio.to_thread(ensure_image_within_limits, str(temp_path))
+                images.append(result_path)
         return images
 
     async def _handle_interaction(self, interaction: discord.Interaction) -> None:
         """Handle button interactions (permission responses)."""
-        from session import sessions, resolve_permission
+        session_module = _session()
 
         if not interaction.data:
             return
@@ -222,31 +348,20 @@ class DiscordListener(TransportListener):
 
             channel = interaction.channel
             session_id = channel.id if channel else None
-            session = sessions.get(session_id) if session_id else None
+            session = session_module.sessions.get(session_id) if session_id else None
 
             if session and session.logger:
                 session.logger.log_permission_callback(request_id, action, tool_name)
 
-            if action == "allow":
-                success = await resolve_permission(request_id, allowed=True, always=False, tool_name=tool_name)
-                if success:
-                    await interaction.response.edit_message(content=f"✅ Allowed `{tool_name}` (one-time)", view=None)
-                else:
-                    await interaction.response.edit_message(content="⚠️ Permission request expired", view=None)
-
-            elif action == "deny":
-                success = await resolve_permission(request_id, allowed=False, always=False, tool_name=tool_name)
-                if success:
-                    await interaction.response.edit_message(content=f"❌ Denied `{tool_name}`", view=None)
-                else:
-                    await interaction.response.edit_message(content="⚠️ Permission request expired", view=None)
-
-            elif action == "always":
-                success = await resolve_permission(request_id, allowed=True, always=True, tool_name=tool_name)
-                if success:
-                    await interaction.response.edit_message(content=f"✅ Always allowed `{tool_name}`", view=None)
-                else:
-                    await interaction.response.edit_message(content="⚠️ Permission request expired", view=None)
+            cfg = _PERM_ACTIONS.get(action)
+            if cfg is None:
+                return
+            allowed, always, success_fmt = cfg
+            success = await session_module.resolve_permission(
+                request_id, allowed=allowed, always=always, tool_name=tool_name
+            )
+            content = success_fmt.format(t=tool_name) if success else "⚠️ Permission request expired"
+            await interaction.response.edit_message(content=content, view=None)
 
 
 class _DiscordClient(discord.Client):
@@ -293,5 +408,19 @@ class _DiscordClient(discord.Client):
     async def on_message(self, message: discord.Message) -> None:
         await self._listener._handle_message(message)
 
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        self._listener.invalidate_channel(after.id)
+
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        self._listener.invalidate_channel(channel.id)
+
+    async def on_thread_update(self, before: discord.Thread, after: discord.Thread) -> None:
+        self._listener.invalidate_channel(after.id)
+
+    async def on_thread_delete(self, thread: discord.Thread) -> None:
+        self._listener.invalidate_channel(thread.id)
+
     async def on_interaction(self, interaction: discord.Interaction) -> None:
         await self._listener._handle_interaction(interaction)
@@ -16,7 +16,7 @@ from .formatter import (
     strip_html_tags,
 )
 
-__all__ = [
+__all__ = (
     "TelegramClient",
     "TelegramFormatter",
     "escape_html",
@@ -26,4 +26,4 @@ __all__ = [
     "markdown_to_html",
     "split_text",
     "strip_html_tags",
-]
+)
@@ -10,7 +10,7 @@ from typing import Any, Awaitable, Callable, Optional
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Message, Update
 from telegram.ext import Application, CallbackQueryHandler, CommandHandler, ContextTypes, MessageHandler, filters
 
-from config import GENERAL_TOPIC_ID, PROJECTS_DIR
+from config import GENERAL_TOPIC_ID, PROJECTS_DIR, bloom_contains, bloom_mask
 from core.types import Trigger, make_session_key
 from core.dispatcher import TransportListener
 from utils import ensure_image_within_limits, get_project_folders
@@ -19,6 +19,19 @@ from .reply_target import TelegramReplyTarget
 
 _log = logging.getLogger("tele-claude.telegram.listener")
 
+# Lazily bound on first use: importing session at module level would be
+# circular, but re-running the import statement per event is wasted work.
+_session_module: Any = None
+
+
+def _session() -> Any:
+    global _session_module
+    if _session_module is None:
+        import session
+
+        _session_module = session
+    return _session_module
+
 
 class TelegramListener(TransportListener):
     """Listens for Telegram messages and converts to Triggers."""
@@ -27,7 +40,8 @@ class TelegramListener(TransportListener):
 
     def __init__(self, bot_token: str, allowed_chats: set[int], local_cwd: Optional[str] = None) -> None:
         self._bot_token = bot_token
-        self._allowed_chats = allowed_chats
+        self._allowed_chats = frozenset(allowed_chats)
+        self._allowed_chats_bloom = bloom_mask(self._allowed_chats)
         self._local_cwd = str(Path(local_cwd).resolve()) if local_cwd else None
         self._app: Optional[Application] = None
         self._on_trigger: Optional[Callable[[Trigger], Awaitable[None]]] = None
@@ -98,7 +112,7 @@ class TelegramListener(TransportListener):
         return TelegramReplyTarget(client)
 
     async def create_session(self, trigger: Trigger, cwd: str) -> Any:
-        import session as session_module
+        session_module = _session()
 
         if not self._app:
             raise RuntimeError("TelegramListener not started")
@@ -134,6 +148,8 @@ class TelegramListener(TransportListener):
             return True
         if chat_id is None:
             return False
+        if not bloom_contains(self._allowed_chats_bloom, chat_id):
+            return False
         return chat_id in self._allowed_chats
 
     async def _handle_help(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
@@ -144,8 +160,8 @@ class TelegramListener(TransportListener):
             return
 
         from commands import get_help_message
-        import session as session_module
 
+        session_module = _session()
         thread_id = message.message_thread_id or GENERAL_TOPIC_ID
         session = session_module.sessions.get(thread_id)
         contextual = session.contextual_commands if session else []
@@ -296,8 +312,7 @@ class TelegramListener(TransportListener):
                 if message is None or not isinstance(message, Message):
                     return
 
-                import session as session_module
-
+                session_module = _session()
                 perm_thread_id = message.message_thread_id
                 active_session = session_module.sessions.get(perm_thread_id) if perm_thread_id else None
                 if active_session and active_session.logger:
@@ -48,7 +48,7 @@ from platforms import (
     ThinkingMessage,
     PlatformMessage,
 )
-from platforms.telegram import TelegramClient, TelegramFormatter
+from platforms.telegram import TelegramClient, TelegramFormatter, split_text
 
 # Check if Discord support is available
 try:
@@ -299,6 +299,11 @@ async def interrupt_session(thread_id: int) -> bool:
     2. Wait for reader to drain and receive interrupt ack
     3. Hard cancel only as fallback after timeout
 
+    The wait in phase 2 awaits the task itself, so callers resume the
+    moment the interrupted query actually exits — there is no fixed
+    post-interrupt sleep, and a follow-up prompt pays only the real
+    drain time.
+
     Returns True if an active query was interrupted, False otherwise.
     """
     session = sessions.get(thread_id)
@@ -845,16 +850,28 @@ def start_claude_task(thread_id: int, prompt: str, bot: Optional[Bot] = None) ->
 # --- /model command ---
 
 _cached_models: Optional[list[dict]] = None
+_cached_model_lines: Optional[list[tuple[str, str]]] = None
+
+
+def _render_model_lines(models: list[dict]) -> list[tuple[str, str]]:
+    """Pre-render (value, help line) pairs so /model only appends the current marker."""
+    lines = []
+    for m in models:
+        value = m.get("value", "")
+        desc = m.get("description", m.get("displayName", ""))
+        lines.append((value, f"`{value}` — {desc}"))
+    return lines
 
 
-async def _get_available_models(session: ClaudeSession) -> list[dict]:
+async def _get_available_models(session: ClaudeSession) -> list[tuple[str, str]]:
     """Fetch available models from SDK via get_server_info(), cached globally.
 
     Only caches non-empty results so transient failures are retried.
+    Returns pre-rendered (value, help line) pairs.
     """
-    global _cached_models
-    if _cached_models is not None:
-        return _cached_models
+    global _cached_models, _cached_model_lines
+    if _cached_model_lines is not None:
+        return _cached_model_lines
 
     models: list[dict] = []
     try:
@@ -867,7 +884,9 @@ async def _get_available_models(session: ClaudeSession) -> list[dict]:
 
     if models:
         _cached_models = models
-    return models
+        _cached_model_lines = _render_model_lines(models)
+        return _cached_model_lines
+    return []
 
 
 async def handle_model_command(thread_id: int, args: str) -> None:
@@ -885,11 +904,9 @@ async def handle_model_command(thread_id: int, args: str) -> None:
             return
 
         lines = ["**Available models:**\n"]
-        for m in models:
-            value = m.get("value", "")
-            desc = m.get("description", m.get("displayName", ""))
+        for value, rendered in models:
             marker = "  **← current**" if value == current else ""
-            lines.append(f"`{value}` — {desc}{marker}")
+            lines.append(rendered + marker)
         lines.append(f"\nAlso accepts: `opus`, `opusplan`, or any full model ID")
         lines.append(f"Use `/model <name>` to switch")
         await send_message(session, message=TextMessage("\n".join(lines)))
@@ -1804,29 +1821,3 @@ def format_tool_output(content: Any) -> str:
     if len(text) > 1000:
         return text[:1000] + "\n... (truncated)"
     return text
-
-
-def split_text(text: str, max_len: int = 4000) -> list[str]:
-    """Split text into chunks suitable for Telegram messages."""
-    if len(text) <= max_len:
-        return [text]
-
-    chunks = []
-    while text:
-        if len(text) <= max_len:
-            chunks.append(text)
-            break
-
-        # Try to split at newline
-        split_pos = text.rfind('\n', 0, max_len)
-        if split_pos == -1 or split_pos < max_len // 2:
-            # Try space
-            split_pos = text.rfind(' ', 0, max_len)
-        if split_pos == -1 or split_pos < max_len // 2:
-            # Hard split
-            split_pos = max_len
-
-        chunks.append(text[:split_pos])
-        text = text[split_pos:].lstrip()
-
-    return chunks
@@ -27,33 +27,34 @@ class TestValidateFilePath:
     def test_valid_absolute_path_in_cwd(self, temp_cwd):
         """Absolute path within cwd should be valid."""
         file_path = str(temp_cwd / "test.txt")
-        is_valid, error, resolved = validate_file_path(file_path, str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path(file_path, str(temp_cwd))
         assert is_valid is True
         assert error == ""
         assert resolved == temp_cwd / "test.txt"
+        assert size == len("hello")
 
     def test_valid_relative_path(self, temp_cwd):
         """Relative path should be resolved against cwd."""
-        is_valid, error, resolved = validate_file_path("test.txt", str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path("test.txt", str(temp_cwd))
         assert is_valid is True
         assert error == ""
         assert resolved == temp_cwd / "test.txt"
 
     def test_valid_nested_path(self, temp_cwd):
         """Nested path within cwd should be valid."""
-        is_valid, error, resolved = validate_file_path("subdir/nested.txt", str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path("subdir/nested.txt", str(temp_cwd))
         assert is_valid is True
         assert error == ""
 
     def test_file_not_found(self, temp_cwd):
         """Non-existent file should return error."""
-        is_valid, error, resolved = validate_file_path("nonexistent.txt", str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path("nonexistent.txt", str(temp_cwd))
         assert is_valid is False
         assert "not found" in error.lower()
 
     def test_directory_not_file(self, temp_cwd):
         """Directory path should return error."""
-        is_valid, error, resolved = validate_file_path("subdir", str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path("subdir", str(temp_cwd))
         assert is_valid is False
         assert "not a file" in error.lower()
 
@@ -62,14 +63,14 @@ class TestValidateFilePath:
         # Create a file outside temp_cwd
         outside_file = Path("/etc/passwd")
         if outside_file.exists():
-            is_valid, error, resolved = validate_file_path(str(outside_file), str(temp_cwd))
+            is_valid, error, resolved, size = validate_file_path(str(outside_file), str(temp_cwd))
             assert is_valid is False
             assert "access denied" in error.lower()
 
     def test_path_traversal_attack_blocked(self, temp_cwd):
         """Path traversal attempts should be blocked."""
         # Try to escape cwd with ..
-        is_valid, error, resolved = validate_file_path("../../../etc/passwd", str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path("../../../etc/passwd", str(temp_cwd))
         assert is_valid is False
         # Either file not found (doesn't exist) or access denied (security check)
         assert "not found" in error.lower() or "access denied" in error.lower()
@@ -84,7 +85,7 @@ class TestValidateFilePath:
         try:
             # Use a different cwd (not temp dir)
             cwd = "/tmp/fake_cwd_that_does_not_matter"
-            is_valid, error, resolved = validate_file_path(temp_file, str(Path.home()))
+            is_valid, error, resolved, size = validate_file_path(temp_file, str(Path.home()))
             assert is_valid is True
             assert error == ""
         finally:
@@ -97,7 +98,7 @@ class TestValidateFilePath:
         target_path = temp_cwd / "test.txt"
         link_path.symlink_to(target_path)
 
-        is_valid, error, resolved = validate_file_path(str(link_path), str(temp_cwd))
+        is_valid, error, resolved, size = validate_file_path(str(link_path), str(temp_cwd))
         assert is_valid is True
         # Resolved path should be the actual file
         assert resolved == target_path.resolve()
@@ -114,7 +115,7 @@ class TestValidateFilePath:
             link_path = temp_cwd / "escape_link.txt"
             link_path.symlink_to(outside_file)
 
-            is_valid, error, resolved = validate_file_path(str(link_path), str(temp_cwd))
+            is_valid, error, resolved, size = validate_file_path(str(link_path), str(temp_cwd))
             # Should be allowed because temp files are allowed
             # (the symlink resolves to temp dir which is allowed)
             assert is_valid is True
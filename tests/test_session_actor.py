@@ -123,11 +123,12 @@ async def test_cancel_current_task_cancels_pending_permission(monkeypatch: pytes
     )
 
     actor.current_task = asyncio.create_task(asyncio.sleep(10))
-    pending = asyncio.get_running_loop().create_future()
+    pending = asyncio.Event()
     actor.pending_permission = pending
 
     await actor._cancel_current_task()
 
-    assert pending.cancelled() is True
+    assert pending.is_set() is True
+    assert actor.pending_permission_result is False
     assert actor.pending_permission is None
     assert actor.current_task is None
@@ -137,3 +137,58 @@ class TestSessionStore:
 
         store.update_session_id("key", "", "/cwd", "discord")
         assert store.get("key") is None
+
+    def test_remove_row_is_replayed_from_log(self, tmp_path: Path):
+        """A remove logged after the snapshot wins on reload."""
+        store_path = tmp_path / "sessions.json"
+        store = SessionStore(path=store_path)
+        store.load()
+
+        store.update_session_id("key", "sess1", "/cwd", "discord")
+        store.save()  # snapshot now contains the entry, log is truncated
+        store.remove("key")  # delta row exists only in the log
+
+        store2 = SessionStore(path=store_path)
+        store2.load()
+        assert store2.get("key") is None
+
+    def test_corrupt_log_lines_are_skipped(self, tmp_path: Path):
+        """A corrupt log line doesn't lose the entries around it."""
+        store_path = tmp_path / "sessions.json"
+        store = SessionStore(path=store_path)
+        store.load()
+
+        store.update_session_id("a", "sess_a", "/cwd", "discord")
+        with (tmp_path / "sessions.log").open("a", encoding="utf-8") as log_file:
+            log_file.write("not valid json {{{\n")
+        store.update_session_id("b", "sess_b", "/cwd", "discord")
+
+        store2 = SessionStore(path=store_path)
+        store2.load()
+        assert store2.get("a") is not None
+        assert store2.get("b") is not None
+
+    def test_log_compacts_into_snapshot_at_threshold(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        """Hitting the log-line threshold folds the log into the snapshot."""
+        import core.session_store as session_store_module
+
+        monkeypatch.setattr(session_store_module, "_LOG_COMPACT_LINES", 3)
+        store_path = tmp_path / "sessions.json"
+        store = SessionStore(path=store_path)
+        store.load()
+
+        for i in range(3):
+            store.update_session_id(f"key{i}", f"sess{i}", "/cwd", "discord")
+        # Compaction runs on the store's I/O worker; queue a no-op behind
+        # it and wait so the assertions don't race it.
+        store._io_executor.submit(lambda: None).result()
+
+        assert store_path.exists()
+        assert (tmp_path / "sessions.log").stat().st_size == 0
+
+        store2 = SessionStore(path=store_path)
+        store2.load()
+        for i in range(3):
+            assert store2.get(f"key{i}") is not None